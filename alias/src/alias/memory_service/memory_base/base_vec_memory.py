@@ -1,19 +1,27 @@
 # -*- coding: utf-8 -*-
+import ast
 import asyncio
-import concurrent
+import concurrent.futures
+import functools
 import gc
 import hashlib
+import inspect
 import json
+import os
+import re
+import time
 import uuid
 import warnings
+import weakref
+from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pytz
 from pydantic import ValidationError
 
-from mem0.configs.base import MemoryConfig, MemoryItem
+from mem0.configs.base import MemoryConfig
 from mem0.configs.enums import MemoryType
 from mem0.configs.prompts import (
     PROCEDURAL_MEMORY_SYSTEM_PROMPT,
@@ -37,18 +45,383 @@ from alias.memory_service.profiling_utils.memory_utils import (
     extract_json_from_text,
     run_async_in_thread,
 )
-from .prompt import GET_MEMORY_TYPE
+from .prompt import EXTRACT_USER_EVENT, EXTRACT_USER_INFO, GET_MEMORY_TYPE
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib parser is used without it
+    orjson = None
 
 logger = setup_logging()
 
-setup_config()
 # logger = logger.getLogger(__name__)
 
+_MEMORY_TYPE_SYSTEM_MESSAGE = {"role": "system", "content": GET_MEMORY_TYPE}
+
+# System message and subject of each kind of `_extract_list` extraction
+_LIST_EXTRACTIONS = {
+    "user_info": (
+        {"role": "system", "content": EXTRACT_USER_INFO},
+        "user information",
+    ),
+    "user_event": (
+        {"role": "system", "content": EXTRACT_USER_EVENT},
+        "event information",
+    ),
+}
+
+# Outermost bracketed span of an LLM reply, i.e. the list literal it holds.
+# Greedy on purpose so nested lists and brackets inside items survive.
+_LIST_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+# Payload keys surfaced at the top level of returned memory items, and
+# the keys that are therefore excluded from their "metadata" field.
+_PROMOTED_PAYLOAD_KEYS = ("user_id", "agent_id", "run_id", "actor_id", "role")
+# Payload keys only used internally, never returned in "metadata".
+_INTERNAL_PAYLOAD_KEYS = ("last_access_ts",)
+_NON_METADATA_KEYS = frozenset(
+    {
+        "data",
+        "hash",
+        "created_at",
+        "updated_at",
+        "id",
+        *_PROMOTED_PAYLOAD_KEYS,
+        *_INTERNAL_PAYLOAD_KEYS,
+    },
+)
+
+# Timezone for created_at/updated_at stamps; resolved once at import.
+_PACIFIC_TZ = pytz.timezone("US/Pacific")
+
+# Memory types accepted from the LLM classifier, in preference order.
+_VALID_MEMORY_TYPES = (
+    "Core Memory",
+    "Episodic Memory",
+    "Procedural Memory",
+    "Resource Memory",
+    "Knowledge Vault",
+    "Semantic Memory",
+)
+_VALID_MEMORY_TYPES_LOWER = {
+    memory_type.lower(): memory_type for memory_type in _VALID_MEMORY_TYPES
+}
+
+# Keyword rules for `_rule_based_classification`, checked in order; the
+# first memory type with any keyword in the lowercased content wins.
+_KEYWORD_MAPPINGS = {
+    "Procedural Memory": [
+        "step",
+        "procedure",
+        "process",
+        "instruction",
+        "guide",
+        "tutorial",
+        "how to",
+        "method",
+        "algorithm",
+        "workflow",
+        "protocol",
+    ],
+    "Resource Memory": [
+        "file",
+        "document",
+        "resource",
+        "attachment",
+        "upload",
+        "download",
+        "pdf",
+        "doc",
+        "image",
+        "video",
+        "audio",
+    ],
+    "Knowledge Vault": [
+        "contact",
+        "email",
+        "phone",
+        "address",
+        "credential",
+        "password",
+        "api key",
+        "token",
+        "configuration",
+        "setting",
+    ],
+    "Semantic Memory": [
+        "concept",
+        "definition",
+        "explanation",
+        "theory",
+        "principle",
+        "understanding",
+        "knowledge about",
+        "information about",
+    ],
+}
+_KEYWORD_PATTERNS = tuple(
+    (memory_type, re.compile("|".join(map(re.escape, keywords))))
+    for memory_type, keywords in _KEYWORD_MAPPINGS.items()
+)
+
+# Whether Qdrant collections are switched to int8 scalar quantization.
+_QDRANT_INT8_QUANTIZATION = os.environ.get(
+    "QDRANT_INT8_QUANTIZATION",
+    "false",
+).lower() in ("1", "true", "yes")
+
+# Maximum number of (text, memory_action) embeddings kept per memory.
+_EMBEDDING_CACHE_SIZE = 1024
+
+# Maximum number of LLM responses kept by `_generate_cached_response`, and
+# how long (in seconds) each of them stays valid. A TTL of 0 disables the
+# cache.
+_LLM_RESPONSE_CACHE_SIZE = 256
+_LLM_RESPONSE_CACHE_TTL = float(
+    os.environ.get("MEMORY_LLM_CACHE_TTL", 3600),
+)
+
+# Maximum number of characters of raw content pasted into an extraction
+# prompt, see `_truncate_for_prompt`.
+_MAX_PROMPT_CONTENT_CHARS = int(
+    os.environ.get("MEMORY_MAX_PROMPT_CHARS", 8000),
+)
+
+# Lists/dicts with more items than this are preprocessed on a worker
+# thread by `_preprocess_content_async`.
+_PREPROCESS_INLINE_MAX_ITEMS = 64
+
+
+@functools.cache
+def _llm_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Thread pool for LLM calls, created when the first one is made.
+
+    The mem0 LLM clients are blocking, so their calls run on threads. A
+    dedicated pool keeps slow LLM round trips from exhausting the default
+    executor that embeddings and vector store calls share.
+    """
+    return concurrent.futures.ThreadPoolExecutor(
+        max_workers=int(
+            os.environ.get(
+                "MEMORY_LLM_MAX_WORKERS",
+                (os.cpu_count() or 1) * 5,
+            ),
+        ),
+        thread_name_prefix="memory-llm",
+    )
+
+
+@functools.cache
+def _ensure_mem0_config() -> None:
+    """
+    Run mem0's `setup_config` once per process, when the first memory is
+    created rather than when this module is imported.
+    """
+    setup_config()
+
+
+def _enable_int8_quantization(vector_store: Any, provider: str) -> None:
+    """
+    Turn on Qdrant int8 scalar quantization for the store's collection.
+
+    Qdrant then scans 1-byte quantized vectors kept in RAM and rescores
+    the candidates with the original float vectors, which cuts the
+    bandwidth of the similarity scan roughly 4x. Opt in with
+    ``QDRANT_INT8_QUANTIZATION=true``; other providers are left as-is.
+    """
+    if not _QDRANT_INT8_QUANTIZATION or provider != "qdrant":
+        return
+    try:
+        from qdrant_client import models
+
+        vector_store.client.update_collection(
+            collection_name=vector_store.collection_name,
+            quantization_config=models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                ),
+            ),
+        )
+    except Exception as e:
+        logger.warning("Failed to enable int8 quantization: %s", e)
+
+
+def _merge_update_payload(
+    existing_payload: Dict[str, Any],
+    metadata: Optional[Dict[str, Any]],
+    overrides: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Build the payload written by `_update_memory`.
+
+    Precedence, lowest to highest: the existing payload, the caller's
+    metadata (minus "memory_id"), `overrides`, then the existing promoted
+    keys, which an update never changes. The merge is done with dict
+    unpacking instead of a per-key Python loop.
+    """
+    new_metadata = {**existing_payload, **(metadata or {}), **overrides}
+    if metadata and "memory_id" in metadata:
+        if "memory_id" in existing_payload:
+            new_metadata["memory_id"] = existing_payload["memory_id"]
+        else:
+            del new_metadata["memory_id"]
+    for key in _PROMOTED_PAYLOAD_KEYS:
+        if key in existing_payload:
+            new_metadata[key] = existing_payload[key]
+    return new_metadata
+
+
+def _dumps_for_prompt(content: Any) -> str:
+    """
+    Serialize content that is only pasted into an LLM prompt.
+
+    Compact output lets `json` use its C encoder; `indent=` forces the
+    pure-Python one and only adds whitespace tokens to the prompt.
+    """
+    return json.dumps(content, ensure_ascii=False)
+
+
+def _loads_json(text: str) -> Any:
+    """Parse JSON with orjson when it is installed, else with `json`.
+
+    Both raise a ``ValueError`` subclass on malformed input.
+    """
+    if orjson is not None:
+        return orjson.loads(text.encode("utf-8"))
+    return json.loads(text)
+
+
+def _truncate_for_prompt(text: str) -> str:
+    """
+    Keep only the last `_MAX_PROMPT_CONTENT_CHARS` characters of content
+    that is pasted into an LLM prompt.
+
+    The most recent part of a transcript is kept, since that is where new
+    user information usually is.
+    """
+    if len(text) <= _MAX_PROMPT_CONTENT_CHARS:
+        return text
+    logger.warning(
+        "Truncating prompt content from %s to %s characters",
+        len(text),
+        _MAX_PROMPT_CONTENT_CHARS,
+    )
+    return text[-_MAX_PROMPT_CONTENT_CHARS:]
+
+
+def _content_hash(data: str) -> str:
+    """Dedup key stored in the ``hash`` payload field.
+
+    This is not a security boundary, so BLAKE2b with a 16-byte digest is
+    used: it is faster than MD5 and keeps the same 32-char hex width.
+    """
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def _build_memory_item(
+    memory_id: str,
+    payload: Dict[str, Any],
+    score: Optional[float],
+    include_score: bool,
+) -> Dict[str, Any]:
+    """
+    Build the memory item dict for one vector store record.
+
+    Builds the same dict as `MemoryItem(...).model_dump()` directly,
+    skipping pydantic validation for records we wrote ourselves, then
+    adds the promoted payload keys and the remaining payload as
+    "metadata".
+    """
+    memory_item = {
+        "id": memory_id,
+        "memory": payload["data"],
+        "hash": payload.get("hash"),
+        "metadata": None,
+    }
+    if include_score:
+        memory_item["score"] = score
+    memory_item["created_at"] = payload.get("created_at")
+    memory_item["updated_at"] = payload.get("updated_at")
+
+    for key in _PROMOTED_PAYLOAD_KEYS:
+        if key in payload:
+            memory_item[key] = payload[key]
+
+    additional_metadata = {
+        k: v for k, v in payload.items() if k not in _NON_METADATA_KEYS
+    }
+    if additional_metadata:
+        memory_item["metadata"] = additional_metadata
+
+    return memory_item
+
+
+def _format_memory_item(
+    mem: Any,
+    score: Optional[float] = None,
+    include_score: bool = True,
+) -> Dict[str, Any]:
+    """Format a single vector store record as a memory item dict."""
+    return _build_memory_item(mem.id, mem.payload, score, include_score)
+
+
+def _format_memory_items(
+    memories: List[Any],
+    include_score: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Format a batch of vector store records as memory item dicts.
+
+    The record attributes are pulled out column by column first, so the
+    per-row work is only the dict assembly in `_build_memory_item`.
+    """
+    ids = [mem.id for mem in memories]
+    payloads = [mem.payload for mem in memories]
+    if include_score:
+        scores = [mem.score for mem in memories]
+    else:
+        scores = [None] * len(ids)
+    return [
+        _build_memory_item(memory_id, payload, score, include_score)
+        for memory_id, payload, score in zip(ids, payloads, scores)
+    ]
+
+
+def _format_search_hits(
+    memories: List[Any],
+    threshold: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Drop hits below `threshold` and format the rest with scores."""
+    if threshold is not None:
+        memories = [mem for mem in memories if mem.score >= threshold]
+    return _format_memory_items(memories)
+
 
 class BaseAsyncVectorMemory(MemoryBase):
+    # Whether UPDATE actions in `add` may reuse the records returned by the
+    # similarity search instead of fetching them again. Subclasses whose
+    # `_on_existing_memory_retrieved` rewrites those payloads must disable
+    # it, or the update would be merged into a stale payload.
+    _reuse_retrieved_records = True
+
     # Adapted from mem0.memory.main.AsyncMemory.__init__
-    def __init__(self, config: MemoryConfig = MemoryConfig()):
+    def __init__(
+        self,
+        config: MemoryConfig = MemoryConfig(),
+        vector_store_concurrency: int = 16,
+        llm_concurrency: int = 64,
+    ):
+        _ensure_mem0_config()
         self.config = config
+        # Upper bound on concurrent per-id vector store calls
+        self.vector_store_concurrency = vector_store_concurrency
+        # Upper bound on in-flight LLM requests of this memory, see
+        # `_llm_semaphore`
+        self.llm_concurrency = llm_concurrency
+        self._llm_semaphores = weakref.WeakKeyDictionary()
 
         self.embedding_model = EmbedderFactory.create(
             self.config.embedder.provider,
@@ -59,6 +432,10 @@ class BaseAsyncVectorMemory(MemoryBase):
             self.config.vector_store.provider,
             self.config.vector_store.config,
         )
+        _enable_int8_quantization(
+            self.vector_store,
+            self.config.vector_store.provider,
+        )
         self.llm = LlmFactory.create(
             self.config.llm.provider,
             self.config.llm.config,
@@ -67,6 +444,26 @@ class BaseAsyncVectorMemory(MemoryBase):
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
 
+        # Request scaffolding that is identical for every LLM call; build
+        # it once instead of re-allocating it per request.
+        model_name = self.config.llm.config.get("model") or ""
+        self._json_response_format = {
+            "type": "json_object" if "qwen-max" not in model_name else "text",
+        }
+        custom_fact_prompt = self.config.custom_fact_extraction_prompt
+        self._custom_fact_system_message = (
+            {"role": "system", "content": custom_fact_prompt}
+            if custom_fact_prompt
+            else None
+        )
+
+        # (text, memory_action) -> embedding, see `_embed`
+        self._embedding_cache = OrderedDict()
+        self._pending_embeddings = {}
+        # request hash -> (expiry, response), see `_generate_cached_response`
+        self._llm_response_cache = OrderedDict()
+        self._pending_llm_responses = {}
+
         self.enable_graph = False
 
         if self.config.graph_store.config:
@@ -77,6 +474,11 @@ class BaseAsyncVectorMemory(MemoryBase):
         else:
             self.graph = None
 
+        # Whether graph search must be awaited or run on a worker thread
+        self._graph_search_is_async = inspect.iscoroutinefunction(
+            getattr(self.graph, "search", None),
+        )
+
         capture_event("mem0.init", self, {"sync_type": "async"})
 
     @classmethod
@@ -86,7 +488,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             config = cls._process_config(config_dict)
             config = MemoryConfig(**config_dict)
         except ValidationError as e:
-            logger.error(f"Configuration validation error: {e}")
+            logger.error("Configuration validation error: %s", e)
             raise
         return cls(config)
 
@@ -103,9 +505,130 @@ class BaseAsyncVectorMemory(MemoryBase):
         try:
             return config_dict
         except ValidationError as e:
-            logger.error(f"Configuration validation error: {e}")
+            logger.error("Configuration validation error: %s", e)
             raise
 
+    async def _embed(self, text: str, memory_action: str):
+        """
+        Embed `text` through a per-instance LRU cache keyed on
+        `(text, memory_action)`. Concurrent requests for the same key
+        share a single embedding call.
+        """
+        key = (text, memory_action)
+        embeddings = self._embedding_cache.get(key)
+        if embeddings is not None:
+            self._embedding_cache.move_to_end(key)
+            return embeddings
+
+        pending = self._pending_embeddings.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                asyncio.to_thread(
+                    self.embedding_model.embed,
+                    text,
+                    memory_action,
+                ),
+            )
+            self._pending_embeddings[key] = pending
+            pending.add_done_callback(
+                functools.partial(self._store_embedding, key),
+            )
+        # Shield so that one cancelled caller does not cancel the
+        # embedding for the others waiting on it.
+        return await asyncio.shield(pending)
+
+    async def _embed_many(self, texts: list, memory_action: str) -> dict:
+        """
+        Embed several texts at once and return a `{text: embedding}` map.
+        Duplicates are embedded once, cached texts are served from the
+        cache and the remaining ones are embedded concurrently.
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        embeddings = await asyncio.gather(
+            *(self._embed(text, memory_action) for text in unique_texts),
+        )
+        return dict(zip(unique_texts, embeddings))
+
+    def _llm_semaphore(self) -> asyncio.Semaphore:
+        """
+        Semaphore limiting this memory to `llm_concurrency` LLM calls on
+        the running event loop. One is created per loop, since an asyncio
+        semaphore is bound to the first loop that waits on it.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._llm_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.llm_concurrency)
+            self._llm_semaphores[loop] = semaphore
+        return semaphore
+
+    async def _generate_response(self, **kwargs):
+        """
+        Run `self.llm.generate_response` on the LLM thread pool. Callers
+        beyond the `llm_concurrency` limit wait here rather than holding
+        a pool thread that other memories could use.
+        """
+        async with self._llm_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(
+                _llm_executor(),
+                functools.partial(self.llm.generate_response, **kwargs),
+            )
+
+    async def _generate_cached_response(self, **kwargs):
+        """
+        `_generate_response` behind a per-instance LRU keyed on a hash of
+        the request, for extractions that get replayed with identical
+        input. Entries expire after `_LLM_RESPONSE_CACHE_TTL` seconds, and
+        concurrent identical requests share a single LLM call.
+        """
+        if _LLM_RESPONSE_CACHE_TTL <= 0:
+            return await self._generate_response(**kwargs)
+
+        key = _content_hash(
+            json.dumps(kwargs, ensure_ascii=False, sort_keys=True),
+        )
+        cached = self._llm_response_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._llm_response_cache.move_to_end(key)
+            return cached[1]
+
+        pending = self._pending_llm_responses.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._generate_response(**kwargs))
+            self._pending_llm_responses[key] = pending
+            pending.add_done_callback(
+                functools.partial(self._store_llm_response, key),
+            )
+        # Shield so that one cancelled caller does not cancel the call for
+        # the others waiting on it.
+        return await asyncio.shield(pending)
+
+    def _store_llm_response(self, key: str, future: asyncio.Future) -> None:
+        """Move a finished LLM response from the pending map to the cache."""
+        self._pending_llm_responses.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._llm_response_cache[key] = (
+            time.monotonic() + _LLM_RESPONSE_CACHE_TTL,
+            future.result(),
+        )
+        self._llm_response_cache.move_to_end(key)
+        if len(self._llm_response_cache) > _LLM_RESPONSE_CACHE_SIZE:
+            self._llm_response_cache.popitem(last=False)
+
+    def _store_embedding(
+        self,
+        key: Tuple[str, str],
+        future: asyncio.Future,
+    ) -> None:
+        """Move a finished embedding from the pending map to the cache."""
+        self._pending_embeddings.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._embedding_cache[key] = future.result()
+        if len(self._embedding_cache) > _EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+
     def _prepare_metadata_for_add(
         self,
         metadata: Optional[Dict[str, Any]],
@@ -262,7 +785,7 @@ class BaseAsyncVectorMemory(MemoryBase):
         metadata: dict,
     ) -> list:
         """Add messages directly to vector store without inference."""
-        returned_memories = []
+        valid_messages = []
         for message_dict in messages:
             if (
                 not isinstance(message_dict, dict)
@@ -270,13 +793,24 @@ class BaseAsyncVectorMemory(MemoryBase):
                 or message_dict.get("content") is None
             ):
                 logger.warning(
-                    f"Skipping invalid message format (async): {message_dict}",
+                    "Skipping invalid message format (async): %s",
+                    message_dict,
                 )
                 continue
 
             if message_dict["role"] == "system":
                 continue
 
+            valid_messages.append(message_dict)
+
+        # Embed every message up front instead of one round trip per message
+        embeddings_map = await self._embed_many(
+            [message_dict["content"] for message_dict in valid_messages],
+            "add",
+        )
+
+        returned_memories = []
+        for message_dict in valid_messages:
             per_msg_meta = deepcopy(metadata)
             per_msg_meta["role"] = message_dict["role"]
 
@@ -285,14 +819,9 @@ class BaseAsyncVectorMemory(MemoryBase):
                 per_msg_meta["actor_id"] = actor_name
 
             msg_content = message_dict["content"]
-            msg_embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                msg_content,
-                "add",
-            )
             mem_id = await self._create_memory(
                 msg_content,
-                {msg_content: msg_embeddings},
+                embeddings_map,
                 per_msg_meta,
             )
 
@@ -310,27 +839,21 @@ class BaseAsyncVectorMemory(MemoryBase):
     async def _extract_facts_from_messages(self, messages: list) -> list:
         """Extract facts from messages using LLM."""
         parsed_messages = parse_messages(messages)
-        if self.config.custom_fact_extraction_prompt:
-            system_prompt = self.config.custom_fact_extraction_prompt
+        if self._custom_fact_system_message is not None:
+            system_message = self._custom_fact_system_message
             user_prompt = f"Input:\n{parsed_messages}"
         else:
             system_prompt, user_prompt = get_fact_retrieval_messages(
                 parsed_messages,
             )
+            system_message = {"role": "system", "content": system_prompt}
 
-        response = await asyncio.to_thread(
-            self.llm.generate_response,
+        response = await self._generate_response(
             messages=[
-                {"role": "system", "content": system_prompt},
+                system_message,
                 {"role": "user", "content": user_prompt},
             ],
-            response_format={
-                "type": (
-                    "json_object"
-                    if "qwen-max" not in self.config.llm.config["model"]
-                    else "text"
-                ),
-            },
+            response_format=self._json_response_format,
         )
 
         parsed_response = self._parse_llm_json_response(
@@ -348,24 +871,24 @@ class BaseAsyncVectorMemory(MemoryBase):
         content_list: list,
         effective_filters: dict,
     ) -> tuple:
-        """Search for existing memories similar to the given content list."""
+        """Search for existing memories similar to the given content list.
+
+        Returns the retrieved memories, the embeddings of `content_list`
+        and the raw vector-store records keyed by memory ID.
+        """
         retrieved_memories = []
-        embeddings_map = {}
+        retrieved_records = {}
+        embeddings_map = await self._embed_many(content_list, "add")
 
         async def process_content_for_search(content):
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                content,
-                "add",
-            )
-            embeddings_map[content] = embeddings
             existing_mems = await asyncio.to_thread(
                 self.vector_store.search,
                 query=content,
-                vectors=embeddings,
+                vectors=embeddings_map[content],
                 limit=5,
                 filters=effective_filters,
             )
+            retrieved_records.update((mem.id, mem) for mem in existing_mems)
             return [
                 {"id": mem.id, "text": mem.payload["data"]}
                 for mem in existing_mems
@@ -379,24 +902,14 @@ class BaseAsyncVectorMemory(MemoryBase):
         for result_group in search_results_list:
             retrieved_memories.extend(result_group)
 
-        return retrieved_memories, embeddings_map
+        return retrieved_memories, embeddings_map, retrieved_records
 
-    async def _prepare_memory_for_update(
+    def _prepare_memory_for_update(
         self,
         retrieved_memories: list,
-        metadata: dict,
-        effective_filters: dict,
     ) -> tuple:
         """Prepare retrieved memories for update: deduplicate and create
         UUID mapping."""
-        existing_memory_ids = list({item["id"] for item in retrieved_memories})
-        if existing_memory_ids:
-            await self._on_existing_memory_retrieved(
-                existing_memory_ids,
-                metadata,
-                effective_filters,
-            )
-
         # Deduplicate
         unique_data = {item["id"]: item for item in retrieved_memories}
         deduplicated_memories = list(unique_data.values())
@@ -427,9 +940,9 @@ class BaseAsyncVectorMemory(MemoryBase):
                 if isinstance(parsed, dict):
                     if expected_key is None or expected_key in parsed:
                         return parsed
-                logger.error(f"Invalid JSON response: {e}")
+                logger.error("Invalid JSON response: %s", e)
             except Exception as e2:
-                logger.error(f"Error parsing JSON response: {e2}")
+                logger.error("Error parsing JSON response: %s", e2)
             return {}
 
     async def _generate_memory_actions(
@@ -445,19 +958,12 @@ class BaseAsyncVectorMemory(MemoryBase):
         )
 
         try:
-            response = await asyncio.to_thread(
-                self.llm.generate_response,
+            response = await self._generate_response(
                 messages=[{"role": "user", "content": prompt}],
-                response_format={
-                    "type": (
-                        "json_object"
-                        if "qwen-max" not in self.config.llm.config["model"]
-                        else "text"
-                    ),
-                },
+                response_format=self._json_response_format,
             )
         except Exception as e:
-            logger.error(f"Error in new memory actions response: {e}")
+            logger.error("Error in new memory actions response: %s", e)
             return {}
 
         return (
@@ -471,6 +977,7 @@ class BaseAsyncVectorMemory(MemoryBase):
         uuid_mapping: dict,
         embeddings_map: dict,
         metadata: dict,
+        retrieved_records: Optional[dict] = None,
     ):
         """Create a memory task for a specific event type
         (ADD/UPDATE/DELETE)."""
@@ -485,7 +992,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             return None
 
         if event_type not in ("ADD", "UPDATE", "DELETE"):
-            logger.error(f"Unknown event_type: {event_type}")
+            logger.error("Unknown event_type: %s", event_type)
             return None
 
         # Handle UPDATE and DELETE which require action_id
@@ -493,8 +1000,10 @@ class BaseAsyncVectorMemory(MemoryBase):
             action_id = action.get("id")
             if action_id not in uuid_mapping:
                 logger.error(
-                    f"ID {action_id} not found in uuid_mapping for "
-                    f"{event_type} event: {action}",
+                    "ID %s not found in uuid_mapping for %s event: %s",
+                    action_id,
+                    event_type,
+                    action,
                 )
                 return None
             memory_id = uuid_mapping[action_id]
@@ -517,6 +1026,9 @@ class BaseAsyncVectorMemory(MemoryBase):
                         data=action_text,
                         existing_embeddings=embeddings_map,
                         metadata=deepcopy(metadata),
+                        existing_memory=(retrieved_records or {}).get(
+                            memory_id,
+                        ),
                     ),
                 )
             else:  # DELETE
@@ -528,10 +1040,11 @@ class BaseAsyncVectorMemory(MemoryBase):
         except Exception as e:
             error_str = str(e).lower()
             if error_str not in ["not an error", "no error", "success"]:
-                logger.error(f"Error processing memory action (async): {e}")
+                logger.error("Error processing memory action (async): %s", e)
             else:
                 logger.debug(
-                    f"Non-error exception in memory task (async): {e}",
+                    "Non-error exception in memory task (async): %s",
+                    e,
                 )
             return None
 
@@ -541,6 +1054,7 @@ class BaseAsyncVectorMemory(MemoryBase):
         uuid_mapping: dict,
         embeddings_map: dict,
         metadata: dict,
+        retrieved_records: Optional[dict] = None,
     ) -> list:
         """Execute memory actions (ADD/UPDATE/DELETE) based on LLM response."""
         returned_memories = []
@@ -554,27 +1068,32 @@ class BaseAsyncVectorMemory(MemoryBase):
                 uuid_mapping,
                 embeddings_map,
                 metadata,
+                retrieved_records,
             )
             if task_info:
                 memory_tasks.append(task_info)
 
-        logger.info(f"Memory tasks: {memory_tasks}")
+        logger.info("Memory tasks: %s", memory_tasks)
 
         # Execute all tasks
         for task, resp, event_type, mem_id in memory_tasks:
             logger.info(
-                f"Processing memory task: {task}, {resp}, "
-                f"{event_type}, {mem_id}",
+                "Processing memory task: %s, %s, %s, %s",
+                task,
+                resp,
+                event_type,
+                mem_id,
             )
             try:
                 if task is None:
                     logger.warning(
-                        f"Skipping None task for event_type: {event_type}",
+                        "Skipping None task for event_type: %s",
+                        event_type,
                     )
                     continue
 
                 if not hasattr(task, "__await__"):
-                    logger.error(f"Task is not awaitable: {type(task)}")
+                    logger.error("Task is not awaitable: %s", type(task))
                     continue
 
                 result_id = await task
@@ -610,10 +1129,11 @@ class BaseAsyncVectorMemory(MemoryBase):
                     "no error",
                     "success",
                 ]:
-                    logger.error(f"Error awaiting memory task (async): {e}")
+                    logger.error("Error awaiting memory task (async): %s", e)
                 else:
                     logger.debug(
-                        f"Non-error exception in memory task (async): {e}",
+                        "Non-error exception in memory task (async): %s",
+                        e,
                     )
 
         return returned_memories
@@ -651,6 +1171,7 @@ class BaseAsyncVectorMemory(MemoryBase):
         (
             retrieved_memories,
             embeddings_map,
+            retrieved_records,
         ) = await self._search_existing_memories(
             content_list,
             effective_filters,
@@ -660,17 +1181,28 @@ class BaseAsyncVectorMemory(MemoryBase):
         (
             prepared_memories,
             uuid_mapping,
-        ) = await self._prepare_memory_for_update(
-            retrieved_memories,
-            metadata,
-            effective_filters,
-        )
+        ) = self._prepare_memory_for_update(retrieved_memories)
 
-        # Generate memory actions from LLM
-        memory_actions = await self._generate_memory_actions(
-            prepared_memories,
-            content_list,
-        )
+        # Generate memory actions from LLM. The update prompt does not
+        # depend on the existing-memory hook, so run both concurrently.
+        existing_memory_ids = list(uuid_mapping.values())
+        if existing_memory_ids:
+            _, memory_actions = await asyncio.gather(
+                self._on_existing_memory_retrieved(
+                    existing_memory_ids,
+                    metadata,
+                    effective_filters,
+                ),
+                self._generate_memory_actions(
+                    prepared_memories,
+                    content_list,
+                ),
+            )
+        else:
+            memory_actions = await self._generate_memory_actions(
+                prepared_memories,
+                content_list,
+            )
 
         if not memory_actions:
             logger.info(
@@ -685,6 +1217,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             uuid_mapping,
             embeddings_map,
             metadata,
+            retrieved_records if self._reuse_retrieved_records else None,
         )
 
         capture_event(
@@ -743,44 +1276,7 @@ class BaseAsyncVectorMemory(MemoryBase):
         if not memory:
             return None
 
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-
-        core_and_promoted_keys = {
-            "data",
-            "hash",
-            "created_at",
-            "updated_at",
-            "id",
-            *promoted_payload_keys,
-        }
-
-        result_item = MemoryItem(
-            id=memory.id,
-            memory=memory.payload["data"],
-            hash=memory.payload.get("hash"),
-            created_at=memory.payload.get("created_at"),
-            updated_at=memory.payload.get("updated_at"),
-        ).model_dump()
-
-        for key in promoted_payload_keys:
-            if key in memory.payload:
-                result_item[key] = memory.payload[key]
-
-        additional_metadata = {
-            k: v
-            for k, v in memory.payload.items()
-            if k not in core_and_promoted_keys
-        }
-        if additional_metadata:
-            result_item["metadata"] = additional_metadata
-
-        return result_item
+        return _format_memory_item(memory)
 
     async def get_all(
         self,
@@ -901,47 +1397,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             else memories_result
         )
 
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-        core_and_promoted_keys = {
-            "data",
-            "hash",
-            "created_at",
-            "updated_at",
-            "id",
-            *promoted_payload_keys,
-        }
-
-        formatted_memories = []
-        for mem in actual_memories:
-            memory_item_dict = MemoryItem(
-                id=mem.id,
-                memory=mem.payload["data"],
-                hash=mem.payload.get("hash"),
-                created_at=mem.payload.get("created_at"),
-                updated_at=mem.payload.get("updated_at"),
-            ).model_dump(exclude={"score"})
-
-            for key in promoted_payload_keys:
-                if key in mem.payload:
-                    memory_item_dict[key] = mem.payload[key]
-
-            additional_metadata = {
-                k: v
-                for k, v in mem.payload.items()
-                if k not in core_and_promoted_keys
-            }
-            if additional_metadata:
-                memory_item_dict["metadata"] = additional_metadata
-
-            formatted_memories.append(memory_item_dict)
-
-        return formatted_memories
+        return _format_memory_items(actual_memories, include_score=False)
 
     async def search(
         self,
@@ -979,22 +1435,20 @@ class BaseAsyncVectorMemory(MemoryBase):
                 `{"results": [{"id": "...", "memory": "...", "score": 0.8,
                 ...}]}`
         """
+        # Start embedding the query right away so it overlaps with filter
+        # validation and the graph search.
+        embed_task = asyncio.create_task(self._embed(query, "search"))
 
-        _, effective_filters = build_filters_and_metadata(
-            user_id=user_id,
-            agent_id=agent_id,
-            run_id=run_id,
-            input_filters=filters,
-        )
-
-        if not any(
-            key in effective_filters
-            for key in ("user_id", "agent_id", "run_id")
-        ):
-            raise ValueError(
-                "at least one of 'user_id', 'agent_id', or 'run_id' "
-                "must be specified ",
+        try:
+            effective_filters = self._build_search_filters(
+                user_id,
+                agent_id,
+                run_id,
+                filters,
             )
+        except ValueError:
+            embed_task.cancel()
+            raise
 
         capture_event(
             "mem0.search",
@@ -1007,34 +1461,22 @@ class BaseAsyncVectorMemory(MemoryBase):
             },
         )
 
+        graph_task = None
+        if self.enable_graph:
+            graph_task = asyncio.create_task(
+                self._graph_search(query, effective_filters, limit),
+            )
+
         vector_store_task = asyncio.create_task(
             self._search_vector_store(
                 query,
                 effective_filters,
                 limit,
                 threshold,
+                embeddings=embed_task,
             ),
         )
 
-        graph_task = None
-        if self.enable_graph:
-            if hasattr(
-                self.graph.search,
-                "__await__",
-            ):  # Check if graph search is async
-                graph_task = asyncio.create_task(
-                    self.graph.search(query, effective_filters, limit),
-                )
-            else:
-                graph_task = asyncio.create_task(
-                    asyncio.to_thread(
-                        self.graph.search,
-                        query,
-                        effective_filters,
-                        limit,
-                    ),
-                )
-
         if graph_task:
             original_memories, graph_entities = await asyncio.gather(
                 vector_store_task,
@@ -1060,71 +1502,195 @@ class BaseAsyncVectorMemory(MemoryBase):
         else:
             return {"results": original_memories}
 
+    async def batch_search(
+        self,
+        queries: List[str],
+        *,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        threshold: Optional[float] = None,
+    ):
+        """
+        Searches for memories for several queries at once.
+
+        The queries are embedded together and the per-query searches run
+        concurrently.
+
+        Args:
+            queries (list): Queries to search for.
+            user_id (str, optional): ID of the user to search for.
+                Defaults to None.
+            agent_id (str, optional): ID of the agent to search for.
+                Defaults to None.
+            run_id (str, optional): ID of the run to search for.
+                Defaults to None.
+            limit (int, optional): Limit the number of results per query.
+                Defaults to 10.
+            filters (dict, optional): Filters to apply to every search.
+                Defaults to None.
+            threshold (float, optional): Minimum score for a memory to be
+                included in the results. Defaults to None.
+
+        Returns:
+            list: One `search()`-style result dict per query, in order.
+        """
+        if not queries:
+            return []
+
+        effective_filters = self._build_search_filters(
+            user_id,
+            agent_id,
+            run_id,
+            filters,
+        )
+
+        capture_event(
+            "mem0.batch_search",
+            self,
+            {
+                "limit": limit,
+                "queries": len(queries),
+                "version": self.api_version,
+                "keys": list(effective_filters.keys()),
+                "sync_type": "sync",
+            },
+        )
+
+        graph_task = None
+        if self.enable_graph:
+            graph_task = asyncio.gather(
+                *(
+                    self._graph_search(query, effective_filters, limit)
+                    for query in queries
+                ),
+            )
+
+        try:
+            embeddings = await self._embed_many(queries, "search")
+            results = await self._search_vector_store_batch(
+                queries,
+                [embeddings[query] for query in queries],
+                effective_filters,
+                limit,
+                threshold,
+            )
+        except BaseException:
+            # Do not leave the graph searches running unawaited
+            if graph_task:
+                graph_task.cancel()
+            raise
+
+        if graph_task:
+            relations = await graph_task
+            return [
+                {"results": memories, "relations": graph_entities}
+                for memories, graph_entities in zip(results, relations)
+            ]
+        return [{"results": memories} for memories in results]
+
+    def _build_search_filters(self, user_id, agent_id, run_id, filters):
+        _, effective_filters = build_filters_and_metadata(
+            user_id=user_id,
+            agent_id=agent_id,
+            run_id=run_id,
+            input_filters=filters,
+        )
+
+        if not any(
+            key in effective_filters
+            for key in ("user_id", "agent_id", "run_id")
+        ):
+            raise ValueError(
+                "at least one of 'user_id', 'agent_id', or 'run_id' "
+                "must be specified ",
+            )
+        return effective_filters
+
+    async def _graph_search(self, query, filters, limit):
+        if self._graph_search_is_async:
+            return await self.graph.search(query, filters, limit)
+        return await asyncio.to_thread(
+            self.graph.search,
+            query,
+            filters,
+            limit,
+        )
+
     async def _search_vector_store(
         self,
         query,
         filters,
         limit,
         threshold: Optional[float] = None,
+        embeddings=None,
     ):
         # Adapted from mem0.memory.main.AsyncMemory._search_vector_store
-        embeddings = await asyncio.to_thread(
-            self.embedding_model.embed,
+        # `embeddings` may be the query vector or an awaitable for it
+        if embeddings is None:
+            embeddings = await self._embed(query, "search")
+        elif inspect.isawaitable(embeddings):
+            embeddings = await embeddings
+        return await asyncio.to_thread(
+            self._search_and_format,
             query,
-            "search",
+            embeddings,
+            filters,
+            limit,
+            threshold,
         )
-        memories = await asyncio.to_thread(
-            self.vector_store.search,
+
+    def _search_and_format(
+        self,
+        query,
+        embeddings,
+        filters,
+        limit,
+        threshold: Optional[float] = None,
+    ):
+        """
+        Run the vector store search and format its hits.
+
+        Runs on a worker thread, so formatting a large result set does not
+        block the event loop.
+        """
+        memories = self.vector_store.search(
             query=query,
             vectors=embeddings,
             limit=limit,
             filters=filters,
         )
+        return _format_search_hits(memories, threshold)
 
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-
-        core_and_promoted_keys = {
-            "data",
-            "hash",
-            "created_at",
-            "updated_at",
-            "id",
-            *promoted_payload_keys,
-        }
-
-        original_memories = []
-        for mem in memories:
-            memory_item_dict = MemoryItem(
-                id=mem.id,
-                memory=mem.payload["data"],
-                hash=mem.payload.get("hash"),
-                created_at=mem.payload.get("created_at"),
-                updated_at=mem.payload.get("updated_at"),
-                score=mem.score,
-            ).model_dump()
-
-            for key in promoted_payload_keys:
-                if key in mem.payload:
-                    memory_item_dict[key] = mem.payload[key]
-
-            additional_metadata = {
-                k: v
-                for k, v in mem.payload.items()
-                if k not in core_and_promoted_keys
-            }
-            if additional_metadata:
-                memory_item_dict["metadata"] = additional_metadata
-
-            if threshold is None or mem.score >= threshold:
-                original_memories.append(memory_item_dict)
-
-        return original_memories
+    async def _search_vector_store_batch(
+        self,
+        queries,
+        vectors,
+        filters,
+        limit,
+        threshold: Optional[float] = None,
+    ):
+        """
+        Search the vector store for several query vectors concurrently,
+        returning one formatted hit list per query.
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        self._search_and_format,
+                        query,
+                        vector,
+                        filters,
+                        limit,
+                        threshold,
+                    )
+                    for query, vector in zip(queries, vectors)
+                ),
+            ),
+        )
 
     async def update(self, memory_id, data, metadata=None):
         # Adapted from mem0.memory.main.AsyncMemory.update
@@ -1145,11 +1711,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             {"memory_id": memory_id, "sync_type": "async"},
         )
 
-        embeddings = await asyncio.to_thread(
-            self.embedding_model.embed,
-            data,
-            "update",
-        )
+        embeddings = await self._embed(data, "update")
         existing_embeddings = {data: embeddings}
 
         await self._update_memory(
@@ -1214,13 +1776,9 @@ class BaseAsyncVectorMemory(MemoryBase):
             filters=filters,
         )
 
-        delete_tasks = []
-        for memory in memories[0]:
-            delete_tasks.append(self._delete_memory(memory.id))
-
-        await asyncio.gather(*delete_tasks)
+        await self._delete_memories(memories[0])
 
-        logger.info(f"Deleted {len(memories[0])} memories")
+        logger.info("Deleted %d memories", len(memories[0]))
 
         if self.enable_graph:
             await asyncio.to_thread(self.graph.delete_all, filters)
@@ -1247,15 +1805,11 @@ class BaseAsyncVectorMemory(MemoryBase):
 
     async def _create_memory(self, data, existing_embeddings, metadata=None):
         # Adapted from mem0.memory.main.AsyncMemory._create_memory
-        logger.debug(f"Creating memory with {data=}")
+        logger.debug("Creating memory with data=%r", data)
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
         else:
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                data,
-                memory_action="add",
-            )
+            embeddings = await self._embed(data, "add")
 
         memory_id = (
             metadata["memory_id"]
@@ -1264,10 +1818,8 @@ class BaseAsyncVectorMemory(MemoryBase):
         )
         metadata = metadata or {}
         metadata["data"] = data
-        metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
-        metadata["created_at"] = datetime.now(
-            pytz.timezone("US/Pacific"),
-        ).isoformat()
+        metadata["hash"] = _content_hash(data)
+        metadata["created_at"] = datetime.now(_PACIFIC_TZ).isoformat()
 
         if "memory_id" in metadata:
             del metadata["memory_id"]
@@ -1353,23 +1905,18 @@ class BaseAsyncVectorMemory(MemoryBase):
                 )
                 procedural_memory = response.content
             else:
-                procedural_memory = await asyncio.to_thread(
-                    self.llm.generate_response,
+                procedural_memory = await self._generate_response(
                     messages=parsed_messages,
                 )
         except Exception as e:
-            logger.error(f"Error generating procedural memory summary: {e}")
+            logger.error("Error generating procedural memory summary: %s", e)
             raise
 
         if metadata is None:
             raise ValueError("Metadata cannot be done for procedural memory.")
 
         metadata["memory_type"] = MemoryType.PROCEDURAL.value
-        embeddings = await asyncio.to_thread(
-            self.embedding_model.embed,
-            procedural_memory,
-            memory_action="add",
-        )
+        embeddings = await self._embed(procedural_memory, "add")
         memory_id = await self._create_memory(
             procedural_memory,
             {procedural_memory: embeddings},
@@ -1395,64 +1942,50 @@ class BaseAsyncVectorMemory(MemoryBase):
         data,
         existing_embeddings,
         metadata=None,
+        existing_memory=None,
     ):
         # Adapted from mem0.memory.main.AsyncMemory._update_memory
-        logger.info(f"Updating memory with {data=}")
+        logger.info("Updating memory with data=%r", data)
 
-        try:
-            existing_memory = await asyncio.to_thread(
-                self.vector_store.get,
-                vector_id=memory_id,
-            )
-        except Exception as exc:
-            logger.error(
-                f"Error getting memory with ID {memory_id} during update.",
-            )
-            raise ValueError(
-                f"Error getting memory with ID {memory_id}. "
-                "Please provide a valid 'memory_id'",
-            ) from exc
+        # Callers that already hold the record skip the extra round trip
+        if existing_memory is None:
+            try:
+                existing_memory = await asyncio.to_thread(
+                    self.vector_store.get,
+                    vector_id=memory_id,
+                )
+            except Exception as exc:
+                logger.error(
+                    "Error getting memory with ID %s during update.",
+                    memory_id,
+                )
+                raise ValueError(
+                    f"Error getting memory with ID {memory_id}. "
+                    "Please provide a valid 'memory_id'",
+                ) from exc
 
         prev_value = existing_memory.payload.get("data")
 
-        new_metadata = deepcopy(metadata) if metadata is not None else {}
-
-        new_metadata["data"] = data
-        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
-        new_metadata["created_at"] = existing_memory.payload.get("created_at")
-        new_metadata["updated_at"] = datetime.now(
-            pytz.timezone("US/Pacific"),
-        ).isoformat()
-
-        # Set session_id
-        new_metadata["session_id"] = (
-            metadata.get("session_id", str(uuid.uuid4()))
-            if metadata
-            else str(uuid.uuid4())
+        new_metadata = _merge_update_payload(
+            existing_memory.payload,
+            metadata,
+            {
+                "data": data,
+                "hash": _content_hash(data),
+                "created_at": existing_memory.payload.get("created_at"),
+                "updated_at": datetime.now(_PACIFIC_TZ).isoformat(),
+                "session_id": (
+                    metadata.get("session_id", str(uuid.uuid4()))
+                    if metadata
+                    else str(uuid.uuid4())
+                ),
+            },
         )
 
-        if "memory_id" in new_metadata:
-            del new_metadata["memory_id"]
-
-        # Copy promoted keys from existing memory
-        promoted_keys = ["user_id", "agent_id", "run_id", "actor_id", "role"]
-        for key in promoted_keys:
-            if key in existing_memory.payload:
-                new_metadata[key] = existing_memory.payload[key]
-
-        # Copy remaining metadata from existing memory
-        for k, v in existing_memory.payload.items():
-            if k not in new_metadata:
-                new_metadata[k] = v
-
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
         else:
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                data,
-                "update",
-            )
+            embeddings = await self._embed(data, "update")
 
         await asyncio.to_thread(
             self.vector_store.update,
@@ -1460,7 +1993,11 @@ class BaseAsyncVectorMemory(MemoryBase):
             vector=embeddings,
             payload=new_metadata,
         )
-        logger.info(f"Updating memory with ID {memory_id=} with {data=}")
+        logger.info(
+            "Updating memory with ID memory_id=%r with data=%r",
+            memory_id,
+            data,
+        )
 
         await asyncio.to_thread(
             self.db.add_history,
@@ -1482,7 +2019,7 @@ class BaseAsyncVectorMemory(MemoryBase):
 
     async def _delete_memory(self, memory_id):
         # Adapted from mem0.memory.main.AsyncMemory._delete_memory
-        logger.info(f"Deleting memory with {memory_id=}")
+        logger.info("Deleting memory with memory_id=%r", memory_id)
         existing_memory = await asyncio.to_thread(
             self.vector_store.get,
             vector_id=memory_id,
@@ -1508,6 +2045,142 @@ class BaseAsyncVectorMemory(MemoryBase):
         )
         return memory_id
 
+    async def _delete_memories(self, memories):
+        """Delete already-listed memories in bulk.
+
+        The payloads from ``vector_store.list`` are reused for the history
+        rows, so no per-id ``get`` is needed, and all rows are written in a
+        single SQL transaction.
+        """
+        if not memories:
+            return []
+        memory_ids = [memory.id for memory in memories]
+        logger.info("Deleting %d memories", len(memory_ids))
+
+        await asyncio.to_thread(self._delete_vectors, memory_ids)
+
+        await asyncio.to_thread(
+            self.db.add_history_many,
+            [
+                {
+                    "memory_id": memory.id,
+                    "old_memory": memory.payload.get("data"),
+                    "new_memory": None,
+                    "event": "DELETE",
+                    "actor_id": memory.payload.get("actor_id"),
+                    "role": memory.payload.get("role"),
+                    "is_deleted": 1,
+                }
+                for memory in memories
+            ],
+        )
+
+        for memory_id in memory_ids:
+            capture_event(
+                "mem0._delete_memory",
+                self,
+                {"memory_id": memory_id, "sync_type": "async"},
+            )
+        return memory_ids
+
+    def _delete_vectors(self, memory_ids):
+        for memory_id in memory_ids:
+            self.vector_store.delete(vector_id=memory_id)
+
+    async def _get_memories(self, memory_ids):
+        """Fetch vector store records for `memory_ids`, in the same order.
+
+        The per-id gets run concurrently, and ids that cannot be read come
+        back as None after their error is logged.
+        """
+        results = await self._gather_vector_store_calls(
+            self.vector_store.get,
+            [{"vector_id": memory_id} for memory_id in memory_ids],
+        )
+        records = []
+        for memory_id, result in zip(memory_ids, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    "Error getting memory with ID %s: %s",
+                    memory_id,
+                    result,
+                )
+                result = None
+            records.append(result)
+        return records
+
+    async def _update_memories(self, memory_ids, vectors, payloads):
+        """Write several records back to the vector store at once.
+
+        The per-id updates run concurrently and failures are logged per id.
+        """
+        results = await self._gather_vector_store_calls(
+            self.vector_store.update,
+            [
+                {"vector_id": memory_id, "vector": vector, "payload": payload}
+                for memory_id, vector, payload in zip(
+                    memory_ids,
+                    vectors,
+                    payloads,
+                )
+            ],
+        )
+        for memory_id, result in zip(memory_ids, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    "Error updating memory with ID %s: %s",
+                    memory_id,
+                    result,
+                )
+
+    async def _update_payloads(self, memory_ids, payloads):
+        """Overwrite payloads in place, leaving the stored vectors alone.
+
+        Returns False when the store has no payload-only update, in which
+        case the caller has to write the vectors back as well.
+        """
+        if self.config.vector_store.provider == "qdrant":
+            await asyncio.to_thread(
+                self._overwrite_qdrant_payloads,
+                memory_ids,
+                payloads,
+            )
+            return True
+        return False
+
+    def _overwrite_qdrant_payloads(self, memory_ids, payloads):
+        from qdrant_client import models
+
+        self.vector_store.client.batch_update_points(
+            collection_name=self.vector_store.collection_name,
+            update_operations=[
+                models.OverwritePayloadOperation(
+                    overwrite_payload=models.SetPayload(
+                        payload=payload,
+                        points=[memory_id],
+                    ),
+                )
+                for memory_id, payload in zip(memory_ids, payloads)
+            ],
+        )
+
+    async def _gather_vector_store_calls(self, func, calls):
+        """Run `func(**kwargs)` for each of `calls` on worker threads.
+
+        At most `vector_store_concurrency` calls are in flight at once.
+        Exceptions are returned in place of results, not raised.
+        """
+        semaphore = asyncio.Semaphore(self.vector_store_concurrency)
+
+        async def call(kwargs):
+            async with semaphore:
+                return await asyncio.to_thread(func, **kwargs)
+
+        return await asyncio.gather(
+            *(call(kwargs) for kwargs in calls),
+            return_exceptions=True,
+        )
+
     async def reset(self):
         # Adapted from mem0.memory.main.AsyncMemory.reset
         """
@@ -1530,10 +2203,17 @@ class BaseAsyncVectorMemory(MemoryBase):
         # Use the new async reset method
         await asyncio.to_thread(self.db.reset)
 
+        self._embedding_cache.clear()
+        self._llm_response_cache.clear()
+
         self.vector_store = VectorStoreFactory.create(
             self.config.vector_store.provider,
             self.config.vector_store.config,
         )
+        _enable_int8_quantization(
+            self.vector_store,
+            self.config.vector_store.provider,
+        )
         capture_event("mem0.reset", self, {"sync_type": "async"})
 
     async def get_memory_type(
@@ -1551,7 +2231,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             str: The memory type of the content.
         """
         try:
-            memory_content = self._preprocess_content(content)
+            memory_content = await self._preprocess_content_async(content)
             rule_based_type = self._rule_based_classification(
                 memory_content,
                 context,
@@ -1564,9 +2244,74 @@ class BaseAsyncVectorMemory(MemoryBase):
             return final_type
 
         except Exception as e:
-            logger.warning(f"Error in get_memory_type: {e}")
+            logger.warning("Error in get_memory_type: %s", e)
             return "Core Memory"
 
+    async def _extract_list(self, content: Any, kind: str) -> List[str]:
+        """
+        Ask the LLM for the list of `kind` items (a key of
+        `_LIST_EXTRACTIONS`) found in `content`.
+        """
+        system_message, subject = _LIST_EXTRACTIONS[kind]
+        memory_content = _truncate_for_prompt(
+            await self._preprocess_content_async(content),
+        )
+        user_prompt = (
+            f"Please extract the {subject} from the following "
+            f"content: \n'{memory_content}'"
+        )
+
+        response = await self._generate_response(
+            messages=[
+                system_message,
+                {"role": "user", "content": user_prompt},
+            ],
+        )
+        return self._format_llm_output_to_list(response)
+
+    def _format_llm_output_to_list(self, llm_output: str) -> List[str]:
+        """
+        Convert LLM output into a Python list of strings.
+        """
+        if not llm_output or not isinstance(llm_output, str):
+            return []
+
+        cleaned = llm_output.strip()
+        match = _LIST_RE.search(cleaned)
+        if match:
+            cleaned = match.group(0)
+        else:
+            return []
+
+        # The prompt asks for a JSON array, so try the JSON parser first
+        # and only build a Python AST for single-quoted list literals.
+        try:
+            parsed_list = _loads_json(cleaned)
+        except ValueError:
+            try:
+                parsed_list = ast.literal_eval(cleaned)
+            except (SyntaxError, ValueError):
+                return []
+
+        if isinstance(parsed_list, list):
+            return [str(item).strip() for item in parsed_list]
+        return []
+
+    async def _preprocess_content_async(self, content: Any) -> str:
+        """
+        `_preprocess_content` that does not block the event loop on large
+        message lists or dicts. Strings and small containers are cheap to
+        format and are handled inline.
+        """
+        if isinstance(content, str):
+            return content.strip()
+        if (
+            isinstance(content, (list, dict))
+            and len(content) > _PREPROCESS_INLINE_MAX_ITEMS
+        ):
+            return await asyncio.to_thread(self._preprocess_content, content)
+        return self._preprocess_content(content)
+
     def _preprocess_content(self, content: Any) -> str:
         """Format the content to be preprocessed"""
         try:
@@ -1581,7 +2326,7 @@ class BaseAsyncVectorMemory(MemoryBase):
 
             return str(content).strip()
         except Exception as e:
-            logger.warning(f"Error in content preprocessing: {e}")
+            logger.warning("Error in content preprocessing: %s", e)
             return str(content)
 
     def _preprocess_dict_content(self, content: dict) -> str:
@@ -1594,7 +2339,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             if field in content:
                 return str(content[field]).strip()
 
-        return json.dumps(content, indent=2, ensure_ascii=False)
+        return _dumps_for_prompt(content)
 
     def _preprocess_list_content(self, content: list) -> str:
         """Preprocess list content"""
@@ -1602,7 +2347,7 @@ class BaseAsyncVectorMemory(MemoryBase):
             return ""
 
         if not isinstance(content[0], dict):
-            return json.dumps(content, indent=2, ensure_ascii=False)
+            return _dumps_for_prompt(content)
 
         messages = []
         for item in content:
@@ -1612,15 +2357,7 @@ class BaseAsyncVectorMemory(MemoryBase):
                 elif "message" in item:
                     messages.append(str(item["message"]))
 
-        return (
-            "\n".join(messages)
-            if messages
-            else json.dumps(
-                content,
-                indent=2,
-                ensure_ascii=False,
-            )
-        )
+        return "\n".join(messages) if messages else _dumps_for_prompt(content)
 
     def _rule_based_classification(
         self,
@@ -1637,60 +2374,8 @@ class BaseAsyncVectorMemory(MemoryBase):
 
         content_lower = content.lower()
 
-        # Keyword-based classification
-        keyword_mappings = {
-            "Procedural Memory": [
-                "step",
-                "procedure",
-                "process",
-                "instruction",
-                "guide",
-                "tutorial",
-                "how to",
-                "method",
-                "algorithm",
-                "workflow",
-                "protocol",
-            ],
-            "Resource Memory": [
-                "file",
-                "document",
-                "resource",
-                "attachment",
-                "upload",
-                "download",
-                "pdf",
-                "doc",
-                "image",
-                "video",
-                "audio",
-            ],
-            "Knowledge Vault": [
-                "contact",
-                "email",
-                "phone",
-                "address",
-                "credential",
-                "password",
-                "api key",
-                "token",
-                "configuration",
-                "setting",
-            ],
-            "Semantic Memory": [
-                "concept",
-                "definition",
-                "explanation",
-                "theory",
-                "principle",
-                "understanding",
-                "knowledge about",
-                "information about",
-            ],
-        }
-
-        for memory_type, keywords in keyword_mappings.items():
-            if any(keyword in content_lower for keyword in keywords):
+        for memory_type, pattern in _KEYWORD_PATTERNS:
+            if pattern.search(content_lower):
                 return memory_type
 
         return None
@@ -1729,40 +2414,34 @@ class BaseAsyncVectorMemory(MemoryBase):
                 context_info = json.dumps(context, indent=2)
                 user_prompt += f"\n\nContext information:\n{context_info}"
 
-            memory_type_response = await asyncio.to_thread(
-                self.llm.generate_response,
+            memory_type_response = await self._generate_response(
                 messages=[
-                    {"role": "system", "content": GET_MEMORY_TYPE},
+                    _MEMORY_TYPE_SYSTEM_MESSAGE,
                     {"role": "user", "content": user_prompt},
                 ],
             )
 
             return memory_type_response.strip()
         except Exception as e:
-            logger.error(f"LLM classification failed: {e}")
+            logger.error("LLM classification failed: %s", e)
             return "Core Memory"
 
     def _post_process_classification(self, llm_type: str) -> str:
-        valid_types = [
-            "Core Memory",
-            "Episodic Memory",
-            "Procedural Memory",
-            "Resource Memory",
-            "Knowledge Vault",
-            "Semantic Memory",
-        ]
-
         cleaned_type = llm_type.strip()
+        if cleaned_type in _VALID_MEMORY_TYPES:
+            return cleaned_type
 
-        if cleaned_type not in valid_types:
-            for valid_type in valid_types:
-                if valid_type.lower() in cleaned_type.lower():
-                    return valid_type
+        cleaned_lower = cleaned_type.lower()
+        valid_type = _VALID_MEMORY_TYPES_LOWER.get(cleaned_lower)
+        if valid_type:
+            return valid_type
 
-        if cleaned_type not in valid_types:
-            logger.warning(
-                f"Invalid memory type from LLM: {cleaned_type}, using default",
-            )
-            return "Core Memory"
+        for type_lower, valid_type in _VALID_MEMORY_TYPES_LOWER.items():
+            if type_lower in cleaned_lower:
+                return valid_type
 
-        return cleaned_type
+        logger.warning(
+            "Invalid memory type from LLM: %s, using default",
+            cleaned_type,
+        )
+        return "Core Memory"
@@ -1,16 +1,12 @@
 # -*- coding: utf-8 -*-
 import asyncio
-import hashlib
-import json
+import logging
 import math
 import uuid
-from copy import deepcopy
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-import pytz
-
-from mem0.memory.setup import setup_config
 from mem0.memory.telemetry import capture_event
 from mem0.memory.utils import remove_code_blocks
 
@@ -29,20 +25,153 @@ from alias.memory_service.memory_base.prompt import (
     EXTRACT_START_CHAT_PREFERENCE,
     EXTRACT_UNLIKE_MESSAGE,
     EXTRACT_WORKFLOWS_PROMPT,
+    SESSION_SUMMARY_FALLBACK,
     SESSION_SUMMARY_PROMPT,
     SESSION_SUMMARY_USER_PROMPT,
     SUBTASK_KEY_WORKFLOW_PROMPT,
     SUBTASK_ROADMAP_PROMPT,
 )
 
-from .base_vec_memory import BaseAsyncVectorMemory
+from .base_vec_memory import (
+    _PACIFIC_TZ,
+    BaseAsyncVectorMemory,
+    _content_hash,
+    _dumps_for_prompt,
+    _loads_json,
+    _merge_update_payload,
+)
 
 logger = setup_logging()
 
-setup_config()
+
+def _join_session_content(session_content) -> str:
+    """Render session messages as "role: content" lines."""
+    return "\n".join(
+        [
+            f"{msg.get('role', '')}: {msg.get('content', '')}"
+            for msg in session_content
+        ],
+    )
+
+
+def _join_wrapped_session_content(session_content) -> str:
+    """
+    Render `{"message": {...}}` session entries as "name: content" lines,
+    using the role when a message has no name.
+    """
+    return "\n".join(
+        [
+            f"{message.get('name', message.get('role'))}: "
+            f"{message.get('content', '')}"
+            for message in map(itemgetter("message"), session_content)
+        ],
+    )
+
+
+# Static system messages, built once instead of per LLM request. Each
+# request sends one of them first and the dynamic content after it, so
+# the prompt prefix stays byte-identical across calls and the provider's
+# prefix cache can reuse it.
+_SESSION_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": SESSION_SUMMARY_PROMPT,
+}
+_AGENT_ROADMAP_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": AGENT_ROADMAP_PROMPT,
+}
+_AGENT_KEY_WORKFLOW_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": AGENT_KEY_WORKFLOW_PROMPT,
+}
+_SUBTASK_ROADMAP_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": SUBTASK_ROADMAP_PROMPT,
+}
+_SUBTASK_KEY_WORKFLOW_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": SUBTASK_KEY_WORKFLOW_PROMPT,
+}
+_EXTRACT_WORKFLOWS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": EXTRACT_WORKFLOWS_PROMPT,
+}
+_EDIT_PREFERENCE_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": EXTRACT_EDIT_PREFERENCE,
+}
+_EDIT_FILE_PREFERENCE_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": EXTRACT_EDIT_FILE_PREFERENCE,
+}
+
+# extract_like_unlike_message prompt and its message placeholder, per
+# feedback type
+_FEEDBACK_PROMPTS = {
+    "like": (EXTRACT_LIKE_MESSAGE, "liked_message"),
+    "dislike": (EXTRACT_UNLIKE_MESSAGE, "unliked_message"),
+}
+
+# extract_chat_intent system prompt per chat type
+_CHAT_PROMPT_MAP = {
+    "START_CHAT": EXTRACT_START_CHAT_PREFERENCE,
+    "BREAK_CHAT": EXTRACT_BREAK_CHAT_PREFERENCE,
+    "FOLLOWUP_CHAT": EXTRACT_FOLLOWUP_CHAT_PREFERENCE,
+}
+
+# User message templates of extract_user_edit_intent
+_EDIT_ROADMAP_USER_PROMPT = (
+    "The content of `diff_map` is as follows:\n{diff_map}"
+)
+_EDIT_FILE_USER_PROMPT = (
+    "The output of a `git diff` command is as follows:\n{diff_output}"
+)
+
+
+def _roadmap_user_content(
+    session_summary: Dict[str, Any],
+    contents: str,
+) -> str:
+    """User message shared by the agent and subtask roadmap requests."""
+    return (
+        f"Task type: {session_summary.get('problem_category', '')}\n"
+        f"Task description: {session_summary.get('task', '')}\n"
+        f"Session content: {contents}"
+    )
+
+
+def _has_expected_shape(parsed: Any, required_keys: Tuple[str, ...]) -> bool:
+    """Whether `parsed` is a JSON object holding one of `required_keys`."""
+    return isinstance(parsed, dict) and (
+        not required_keys or any(key in parsed for key in required_keys)
+    )
+
+
+def _best_score_index(
+    scores: List[float],
+    threshold: float = 0.0,
+) -> Optional[int]:
+    """Index of the first top positive score at or above `threshold`."""
+    return max(
+        (
+            index
+            for index, score in enumerate(scores)
+            if score >= threshold and score > 0.0
+        ),
+        key=scores.__getitem__,
+        default=None,
+    )
+
+
+# Supported `abstract_type` values of multi_levels_extract_CollectionSession
+_ABSTRACT_TYPES = ("multi_levels", "agent_levels", "subtask_levels")
 
 
 class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
+    # `_on_existing_memory_retrieved` bumps the visit metadata of the
+    # retrieved records, so updates must read them back from the store.
+    _reuse_retrieved_records = False
+
     async def _on_existing_memory_retrieved(
         self,
         memory_ids: List[str],
@@ -69,12 +198,14 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         filters: Dict[str, Any],
         limit: int,
         threshold: Optional[float] = None,
+        embeddings=None,
     ):
         results = await super()._search_vector_store(
             query,
             filters,
             limit,
             threshold,
+            embeddings=embeddings,
         )
         memory_ids = [item["id"] for item in results if "id" in item]
         if memory_ids:
@@ -84,6 +215,36 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
                 logger.error(f"Failed to update metadata after search: {exc}")
         return results
 
+    async def _search_vector_store_batch(
+        self,
+        queries: List[str],
+        vectors: List[List[float]],
+        filters: Dict[str, Any],
+        limit: int,
+        threshold: Optional[float] = None,
+    ):
+        results = await super()._search_vector_store_batch(
+            queries,
+            vectors,
+            filters,
+            limit,
+            threshold,
+        )
+        memory_ids = list(
+            dict.fromkeys(
+                item["id"]
+                for memories in results
+                for item in memories
+                if "id" in item
+            ),
+        )
+        if memory_ids:
+            try:
+                await self._update_metadata(memory_ids)
+            except Exception as exc:
+                logger.error(f"Failed to update metadata after search: {exc}")
+        return results
+
     async def reset_metadata(self, memory_id):
         capture_event(
             "mem0.reset_metadata",
@@ -98,23 +259,17 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         if not candidates:
             return None, None
 
-        now_ts = datetime.now(pytz.timezone("US/Pacific")).timestamp()
-        highest_score = 0.0
-        highest_score_memory = None
-
-        for candidate in candidates:
-            total_score = await self.compute_score(
-                visited_count=candidate["metadata"].get("visited_count", 1),
-                last_access_time=candidate["metadata"].get("last_access_time"),
-                now_ts=now_ts,
-            )
+        now_ts = datetime.now(_PACIFIC_TZ).timestamp()
 
-            if total_score > highest_score:
-                highest_score = total_score
-                highest_score_memory = candidate
+        scores = self._score_candidates(candidates, now_ts)
 
-            logger.info(
-                f"Updated score for memory {candidate['id']}, {total_score}",
+        best = _best_score_index(scores)
+        if best is None:
+            highest_score_memory, highest_score = None, 0.0
+        else:
+            highest_score_memory, highest_score = (
+                candidates[best],
+                scores[best],
             )
 
         capture_event(
@@ -128,25 +283,18 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         if not candidates:
             return None, None
 
-        now_ts = datetime.now(pytz.timezone("US/Pacific")).timestamp()
-        highest_score = 0.0
-        highest_score_memory = None
-
+        now_ts = datetime.now(_PACIFIC_TZ).timestamp()
         threshold = 0.95 * (1.0 - (1 / len(candidates)))
 
-        for candidate in candidates:
-            total_score = await self.compute_score(
-                visited_count=candidate["metadata"].get("visited_count", 1),
-                last_access_time=candidate["metadata"].get("last_access_time"),
-                now_ts=now_ts,
-            )
-
-            if total_score >= threshold and total_score > highest_score:
-                highest_score = total_score
-                highest_score_memory = candidate
+        scores = self._score_candidates(candidates, now_ts)
 
-            logger.info(
-                f"Updated score for memory {candidate['id']}, {total_score}",
+        best = _best_score_index(scores, threshold)
+        if best is None:
+            highest_score_memory, highest_score = None, 0.0
+        else:
+            highest_score_memory, highest_score = (
+                candidates[best],
+                scores[best],
             )
 
         capture_event(
@@ -156,23 +304,51 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         )
         return highest_score_memory, highest_score
 
-    async def compute_score(
-        self,
+    def _score_candidates(self, candidates, now_ts) -> List[float]:
+        """Score every candidate search result against `now_ts`."""
+        scores = [
+            self.compute_score(
+                visited_count=candidate["metadata"].get("visited_count", 1),
+                last_access_time=candidate["metadata"].get("last_access_time"),
+                now_ts=now_ts,
+            )
+            for candidate in candidates
+        ]
+        # One record per batch instead of one per candidate
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Scored %d candidate memories: %s",
+                len(scores),
+                {
+                    candidate["id"]: score
+                    for candidate, score in zip(candidates, scores)
+                },
+            )
+        return scores
+
+    @staticmethod
+    def compute_score(
         visited_count,
         last_access_time,
         now_ts,
         max_time_diff: float = 1.0,
         temperature: float = 1e-3,
+        last_access_ts: Optional[float] = None,
     ):
-        try:
-            last_access_time = datetime.fromisoformat(
-                last_access_time,
-            ).timestamp()
-        except Exception:
-            logger.warning(
-                f"Invalid format of last_access_time: {last_access_time}",
-            )
-            last_access_time = 0
+        # Records written since `last_access_ts` was introduced carry the
+        # epoch seconds already; only older ones need the ISO string parsed.
+        if last_access_ts is not None:
+            last_access_time = last_access_ts
+        else:
+            try:
+                last_access_time = datetime.fromisoformat(
+                    last_access_time,
+                ).timestamp()
+            except Exception:
+                logger.warning(
+                    f"Invalid format of last_access_time: {last_access_time}",
+                )
+                last_access_time = 0
 
         time_diff_hours = (now_ts - last_access_time) / 3600
         time_score = math.exp(-temperature * time_diff_hours)
@@ -193,6 +369,7 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         update_score_only: bool,
         now: str,
         memory_ids_count: int,
+        now_ts: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Prepare metadata for memory update.
@@ -205,6 +382,8 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
             update_score_only: Whether to update score only.
             now: Current timestamp as ISO string.
             memory_ids_count: Number of memory IDs being updated.
+            now_ts: Current timestamp as epoch seconds, stored next to
+                `now` so scoring does not have to parse it back.
 
         Returns:
             Dictionary with prepared metadata.
@@ -237,20 +416,16 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         else:
             metadata["visited_count"] = visited_count + 1
             metadata["last_access_time"] = now
+            if now_ts is not None:
+                metadata["last_access_ts"] = now_ts
 
-        for key in ("user_id", "agent_id", "run_id", "actor_id", "role"):
-            if key in existing_memory.payload:
-                metadata[key] = existing_memory.payload[key]
-
-        for key, value in existing_memory.payload.items():
-            if key not in metadata:
-                metadata[key] = value
-
-        return metadata
+        # Every other payload key, promoted ones included, is carried over
+        # unchanged; a single merge does that without a per-key loop.
+        return {**existing_memory.payload, **metadata}
 
     async def _update_metadata(
         self,
-        memory_ids,
+        memory_ids: Union[str, Iterable[str]],
         visited_count_reset: bool = False,
         update_score_only: bool = False,
         updated_score: Optional[float] = None,
@@ -259,69 +434,105 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
 
         if isinstance(memory_ids, str):
             memory_ids = [memory_ids]
-        elif not isinstance(memory_ids, list):
-            raise ValueError("memories should be a str or a list")
-
-        now = datetime.now(pytz.timezone("US/Pacific")).isoformat()
-        now_ts = datetime.fromisoformat(now).timestamp()
-
-        for memory_id in memory_ids:
+        else:
             try:
-                existing_memory = await asyncio.to_thread(
-                    self.vector_store.get,
-                    vector_id=memory_id,
-                )
-            except Exception as exc:
-                logger.error(
-                    f"Error getting memory with ID {memory_id} during "
-                    f"metadata update.",
-                )
+                memory_ids = list(memory_ids)
+            except TypeError as exc:
                 raise ValueError(
-                    f"Error getting memory with ID {memory_id}. "
-                    f"Please check the validity of the 'memory_id'",
+                    "memories should be a str or an iterable of str",
                 ) from exc
 
+        now_dt = datetime.now(_PACIFIC_TZ)
+        now = now_dt.isoformat()
+        now_ts = now_dt.timestamp()
+
+        try:
+            existing_memories = await self._get_memories(memory_ids)
+        except Exception as exc:
+            logger.error(
+                f"Error getting memories with IDs {memory_ids} during "
+                f"metadata update.",
+            )
+            raise ValueError(
+                f"Error getting memories with IDs {memory_ids}. "
+                f"Please check the validity of the 'memory_id'",
+            ) from exc
+
+        found = [
+            (memory_id, existing_memory)
+            for memory_id, existing_memory in zip(
+                memory_ids,
+                existing_memories,
+            )
+            if existing_memory is not None
+        ]
+        if not found:
+            raise ValueError(
+                f"Error getting memories with IDs {memory_ids}. "
+                f"Please check the validity of the 'memory_id'",
+            )
+        if len(found) < len(memory_ids):
+            logger.error(
+                f"Skipping metadata update for "
+                f"{len(memory_ids) - len(found)} unreadable memories",
+            )
+
+        updated_ids = []
+        vectors = []
+        payloads = []
+        for memory_id, existing_memory in found:
             visited_count = existing_memory.payload.get("visited_count") or 0
             last_access_time = existing_memory.payload.get("last_access_time")
 
             if update_score_only and updated_score is None:
                 logger.warning("No SCORE provided, computing score")
-                updated_score = await self.compute_score(
+                updated_score = self.compute_score(
                     visited_count=visited_count,
                     last_access_time=last_access_time,
                     now_ts=now_ts,
+                    last_access_ts=existing_memory.payload.get(
+                        "last_access_ts",
+                    ),
                 )
 
-            metadata = self._prepare_update_metadata(
-                existing_memory,
-                visited_count,
-                last_access_time,
-                visited_count_reset,
-                update_score_only,
-                now,
-                len(memory_ids),
-            )
-
-            memory_data = existing_memory.payload["data"]
-            embeddings = (
-                await asyncio.to_thread(
-                    self.embedding_model.embed,
-                    memory_data,
-                    "update metadata",
-                )
-                if existing_memory.vector is None
-                else existing_memory.vector
+            payloads.append(
+                self._prepare_update_metadata(
+                    existing_memory,
+                    visited_count,
+                    last_access_time,
+                    visited_count_reset,
+                    update_score_only,
+                    now,
+                    len(memory_ids),
+                    now_ts,
+                ),
             )
 
-            await asyncio.to_thread(
-                self.vector_store.update,
-                vector_id=memory_id,
-                vector=embeddings,
-                payload=metadata,
-            )
-            logger.info(
-                f"Updating memory with ID {memory_id=} with new metadata",
+            updated_ids.append(memory_id)
+
+        # Only the payload changes here, so avoid re-sending (or worse,
+        # re-embedding) the vectors when the store can update in place.
+        if not await self._update_payloads(updated_ids, payloads):
+            # Records returned without a vector are embedded in one
+            # deduplicated, concurrent pass instead of one call each.
+            missing_embeddings = await self._embed_many(
+                [
+                    existing_memory.payload["data"]
+                    for _, existing_memory in found
+                    if existing_memory.vector is None
+                ],
+                "update metadata",
             )
+            for _, existing_memory in found:
+                vectors.append(
+                    missing_embeddings[existing_memory.payload["data"]]
+                    if existing_memory.vector is None
+                    else existing_memory.vector,
+                )
+            await self._update_memories(updated_ids, vectors, payloads)
+        logger.info(
+            f"Updated metadata for memories with IDs {updated_ids}",
+        )
 
         return memory_ids
 
@@ -331,63 +542,56 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         data,
         existing_embeddings,
         metadata=None,
+        existing_memory=None,
     ):
         logger.info(f"Updating memory with {data=}")
 
-        try:
-            existing_memory = await asyncio.to_thread(
-                self.vector_store.get,
-                vector_id=memory_id,
-            )
-        except Exception as exc:
-            logger.error(
-                f"Error getting memory with ID {memory_id} during update.",
-            )
-            raise ValueError(
-                f"Error getting memory with ID {memory_id}. "
-                f"Please provide a valid 'memory_id'",
-            ) from exc
+        if existing_memory is None:
+            try:
+                existing_memory = await asyncio.to_thread(
+                    self.vector_store.get,
+                    vector_id=memory_id,
+                )
+            except Exception as exc:
+                logger.error(
+                    f"Error getting memory with ID {memory_id} during update.",
+                )
+                raise ValueError(
+                    f"Error getting memory with ID {memory_id}. "
+                    f"Please provide a valid 'memory_id'",
+                ) from exc
 
-        now = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+        now_dt = datetime.now(_PACIFIC_TZ)
+        now = now_dt.isoformat()
         prev_value = existing_memory.payload.get("data")
 
-        new_metadata = deepcopy(metadata) if metadata is not None else {}
-
-        new_metadata["data"] = data
-        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
-        new_metadata["created_at"] = existing_memory.payload.get("created_at")
-        new_metadata["updated_at"] = now
-        new_metadata["visited_count"] = (
-            existing_memory.payload.get("visited_count") or 0
-        ) + 1
-        new_metadata["last_access_time"] = now
         if metadata is None:
-            new_metadata["session_id"] = str(uuid.uuid4())
+            session_id = str(uuid.uuid4())
         else:
-            new_metadata["session_id"] = metadata.get(
-                "session_id",
-                str(uuid.uuid4()),
-            )
+            session_id = metadata.get("session_id", str(uuid.uuid4()))
 
-        if "memory_id" in new_metadata:
-            del new_metadata["memory_id"]
-
-        for key in ("user_id", "agent_id", "run_id", "actor_id", "role"):
-            if key in existing_memory.payload:
-                new_metadata[key] = existing_memory.payload[key]
-
-        for key, value in existing_memory.payload.items():
-            if key not in new_metadata:
-                new_metadata[key] = value
+        new_metadata = _merge_update_payload(
+            existing_memory.payload,
+            metadata,
+            {
+                "data": data,
+                "hash": _content_hash(data),
+                "created_at": existing_memory.payload.get("created_at"),
+                "updated_at": now,
+                "visited_count": (
+                    existing_memory.payload.get("visited_count") or 0
+                )
+                + 1,
+                "last_access_time": now,
+                "last_access_ts": now_dt.timestamp(),
+                "session_id": session_id,
+            },
+        )
 
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
         else:
-            embeddings = await asyncio.to_thread(
-                self.embedding_model.embed,
-                data,
-                "update",
-            )
+            embeddings = await self._embed(data, "update")
 
         await asyncio.to_thread(
             self.vector_store.update,
@@ -420,16 +624,10 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
 
     async def one_step_extract_CollectionSession(self, session_content):
         try:
-            contents = []
-            for msg in session_content:
-                contents.append(
-                    f"{msg.get('role', '')}: {msg.get('content', '')}",
-                )
-            contents = "\n".join(contents)
-            session_summary_response = await asyncio.to_thread(
-                self.llm.generate_response,
+            contents = _join_session_content(session_content)
+            session_summary_response = await self._generate_response(
                 messages=[
-                    {"role": "system", "content": SESSION_SUMMARY_PROMPT},
+                    _SESSION_SUMMARY_SYSTEM_MESSAGE,
                     {
                         "role": "user",
                         "content": (
@@ -438,48 +636,22 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
                         ),
                     },
                 ],
-                response_format={
-                    "type": (
-                        "json_object"
-                        if "qwen-max" not in self.config.llm.config["model"]
-                        else "text"
-                    ),
-                },
+                response_format=self._json_response_format,
             )
 
-            try:
-                session_summary = json.loads(
-                    remove_code_blocks(session_summary_response),
-                )
-                logger.info(
-                    f"session_summary_response: \n{session_summary_response}",
-                )
-            except Exception as exc:
-                try:
-                    session_summary = extract_json_from_text(
-                        session_summary_response,
-                    )
-                    if not isinstance(session_summary, dict):
-                        logger.error(
-                            f"Error in extracting session summary: {exc}",
-                        )
-                        session_summary = {
-                            "task": "Unknown Task Type",
-                            "problem_category": "Unknown Task Type",
-                        }
-                except Exception as exc_inner:
-                    logger.error(
-                        f"Error in extracting session summary: {exc_inner}",
-                    )
-                    session_summary = {
-                        "task": "Unknown Task Type",
-                        "problem_category": "Unknown Task Type",
-                    }
-
-            full_workflows_response = await asyncio.to_thread(
-                self.llm.generate_response,
+            logger.info(
+                f"session_summary_response: \n{session_summary_response}",
+            )
+            session_summary = self._parse_json_with_fallback(
+                session_summary_response,
+                dict(SESSION_SUMMARY_FALLBACK),
+                "extracting session summary",
+                required_keys=tuple(SESSION_SUMMARY_FALLBACK),
+            )
+
+            full_workflows_response = await self._generate_response(
                 messages=[
-                    {"role": "system", "content": EXTRACT_WORKFLOWS_PROMPT},
+                    _EXTRACT_WORKFLOWS_SYSTEM_MESSAGE,
                     {
                         "role": "user",
                         "content": (
@@ -491,40 +663,18 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
                         ),
                     },
                 ],
-                response_format={
-                    "type": (
-                        "json_object"
-                        if "qwen-max" not in self.config.llm.config["model"]
-                        else "text"
-                    ),
-                },
+                response_format=self._json_response_format,
             )
 
-            try:
-                logger.info(
-                    f"Full workflows response: \n{full_workflows_response}",
-                )
-                full_workflows = json.loads(
-                    remove_code_blocks(full_workflows_response),
-                )
-            except Exception as exc:
-                try:
-                    full_workflows = extract_json_from_text(
-                        full_workflows_response,
-                    )
-                    if (
-                        not isinstance(full_workflows, dict)
-                        or "workflows" not in full_workflows
-                    ):
-                        logger.error(
-                            f"Error in extracting key workflows: {exc}",
-                        )
-                        full_workflows = {"workflows": []}
-                except Exception as exc_inner:
-                    logger.error(
-                        f"Error in extracting key workflows: {exc_inner}",
-                    )
-                    full_workflows = {"workflows": []}
+            logger.info(
+                f"Full workflows response: \n{full_workflows_response}",
+            )
+            full_workflows = self._parse_json_with_fallback(
+                full_workflows_response,
+                {"workflows": []},
+                "extracting key workflows",
+                required_keys=("workflows",),
+            )
 
             final_result = {
                 "task_type": session_summary.get("problem_category", ""),
@@ -542,6 +692,7 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         response: str,
         default_value: Dict[str, Any],
         error_context: str,
+        required_keys: Tuple[str, ...] = (),
     ) -> Dict[str, Any]:
         """
         Parse JSON from response with fallback extraction.
@@ -550,22 +701,35 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
             response: The response string to parse.
             default_value: Default value if parsing fails.
             error_context: Context for error logging.
+            required_keys: Keys of which the parsed JSON object must
+                contain at least one; any object is accepted when empty.
 
         Returns:
             Parsed dictionary or default value.
         """
-        try:
-            return json.loads(remove_code_blocks(response))
-        except Exception as exc:
+        text = remove_code_blocks(response)
+        # Only attempt a direct parse on something shaped like a JSON
+        # document; prose-wrapped answers go straight to the extraction.
+        if text[:1] in ("{", "["):
             try:
-                parsed = extract_json_from_text(response)
-                if not isinstance(parsed, dict):
-                    logger.error(f"Error in {error_context}: {exc}")
-                    return default_value
-                return parsed
-            except Exception as exc_inner:
-                logger.error(f"Error in {error_context}: {exc_inner}")
+                parsed = _loads_json(text)
+            except Exception as parse_exc:
+                exc = parse_exc
+            else:
+                if _has_expected_shape(parsed, required_keys):
+                    return parsed
+                exc = ValueError("response JSON has an unexpected shape")
+        else:
+            exc = ValueError("response does not start with a JSON document")
+        try:
+            parsed = extract_json_from_text(response)
+            if not _has_expected_shape(parsed, required_keys):
+                logger.error(f"Error in {error_context}: {exc}")
                 return default_value
+            return parsed
+        except Exception as exc_inner:
+            logger.error(f"Error in {error_context}: {exc_inner}")
+            return default_value
 
     async def _extract_session_summary(
         self,
@@ -580,10 +744,9 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         Returns:
             Dictionary with session summary.
         """
-        session_summary_response = await asyncio.to_thread(
-            self.llm.generate_response,
+        session_summary_response = await self._generate_response(
             messages=[
-                {"role": "system", "content": SESSION_SUMMARY_PROMPT},
+                _SESSION_SUMMARY_SYSTEM_MESSAGE,
                 {
                     "role": "user",
                     "content": (
@@ -592,23 +755,14 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
                     ),
                 },
             ],
-            response_format={
-                "type": (
-                    "json_object"
-                    if "qwen-max" not in self.config.llm.config["model"]
-                    else "text"
-                ),
-            },
+            response_format=self._json_response_format,
         )
 
-        default_summary = {
-            "task": "Unknown Task Type",
-            "problem_category": "Unknown Task Type",
-        }
         return self._parse_json_with_fallback(
             session_summary_response,
-            default_summary,
+            dict(SESSION_SUMMARY_FALLBACK),
             "extracting session summary",
+            required_keys=tuple(SESSION_SUMMARY_FALLBACK),
         )
 
     async def _extract_agent_roadmap(
@@ -626,29 +780,18 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         Returns:
             Dictionary with agent key path or None.
         """
-        problem_category_val = session_summary.get("problem_category", "")
-        task_desc = session_summary.get("task", "")
-
-        agent_roadmap_response = await asyncio.to_thread(
-            self.llm.generate_response,
+        agent_roadmap_response = await self._generate_response(
             messages=[
-                {"role": "system", "content": AGENT_ROADMAP_PROMPT},
+                _AGENT_ROADMAP_SYSTEM_MESSAGE,
                 {
                     "role": "user",
-                    "content": (
-                        f"Task type: {problem_category_val}\n"
-                        f" Task description: {task_desc}\n"
-                        f" Session content: {contents}"
+                    "content": _roadmap_user_content(
+                        session_summary,
+                        contents,
                     ),
                 },
             ],
-            response_format={
-                "type": (
-                    "json_object"
-                    if "qwen-max" not in self.config.llm.config["model"]
-                    else "text"
-                ),
-            },
+            response_format=self._json_response_format,
         )
 
         default_roadmap = {"roadmap": []}
@@ -656,6 +799,7 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
             agent_roadmap_response,
             default_roadmap,
             "extracting agent roadmap",
+            required_keys=("roadmap",),
         )
 
         def agent_roadmap_to_text(roadmap_json):
@@ -679,25 +823,15 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
 
         agent_roadmap_text = agent_roadmap_to_text(agent_roadmap)
 
-        agent_key_path_response = await asyncio.to_thread(
-            self.llm.generate_response,
+        agent_key_path_response = await self._generate_response(
             messages=[
-                {
-                    "role": "system",
-                    "content": AGENT_KEY_WORKFLOW_PROMPT,
-                },
+                _AGENT_KEY_WORKFLOW_SYSTEM_MESSAGE,
                 {
                     "role": "user",
                     "content": f"Agent roadmap:\n{agent_roadmap_text}",
                 },
             ],
-            response_format={
-                "type": (
-                    "json_object"
-                    if "qwen-max" not in self.config.llm.config["model"]
-                    else "text"
-                ),
-            },
+            response_format=self._json_response_format,
         )
 
         default_key_path = {"workflows": []}
@@ -705,6 +839,7 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
             agent_key_path_response,
             default_key_path,
             "extracting agent key path",
+            required_keys=("workflows",),
         )
 
         return agent_key_path
@@ -724,29 +859,18 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         Returns:
             Dictionary with subtask key path or None.
         """
-        problem_category_val = session_summary.get("problem_category", "")
-        task_desc = session_summary.get("task", "")
-
-        subtask_roadmap_response = await asyncio.to_thread(
-            self.llm.generate_response,
+        subtask_roadmap_response = await self._generate_response(
             messages=[
-                {"role": "system", "content": SUBTASK_ROADMAP_PROMPT},
+                _SUBTASK_ROADMAP_SYSTEM_MESSAGE,
                 {
                     "role": "user",
-                    "content": (
-                        f"Task type: {problem_category_val}\n"
-                        f"Task description: {task_desc}\n"
-                        f"Session content: {contents}"
+                    "content": _roadmap_user_content(
+                        session_summary,
+                        contents,
                     ),
                 },
             ],
-            response_format={
-                "type": (
-                    "json_object"
-                    if "qwen-max" not in self.config.llm.config["model"]
-                    else "text"
-                ),
-            },
+            response_format=self._json_response_format,
         )
 
         default_roadmap = {"roadmap": []}
@@ -754,6 +878,7 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
             subtask_roadmap_response,
             default_roadmap,
             "extracting subtask roadmap",
+            required_keys=("roadmap",),
         )
 
         def subtask_roadmap_to_text(roadmap_json):
@@ -777,25 +902,15 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
 
         subtask_roadmap_text = subtask_roadmap_to_text(subtask_roadmap)
 
-        subtask_key_path_response = await asyncio.to_thread(
-            self.llm.generate_response,
+        subtask_key_path_response = await self._generate_response(
             messages=[
-                {
-                    "role": "system",
-                    "content": SUBTASK_KEY_WORKFLOW_PROMPT,
-                },
+                _SUBTASK_KEY_WORKFLOW_SYSTEM_MESSAGE,
                 {
                     "role": "user",
                     "content": (f"Subtask roadmap:\n{subtask_roadmap_text}"),
                 },
             ],
-            response_format={
-                "type": (
-                    "json_object"
-                    if "qwen-max" not in self.config.llm.config["model"]
-                    else "text"
-                ),
-            },
+            response_format=self._json_response_format,
         )
 
         default_key_path = {"workflows": []}
@@ -803,6 +918,7 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
             subtask_key_path_response,
             default_key_path,
             "extracting subtask key path",
+            required_keys=("workflows",),
         )
 
         return subtask_key_path
@@ -879,25 +995,30 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         abstract_type="multi_levels",
     ):
         try:
-            contents = []
-            for msg in session_content:
-                contents.append(
-                    f"{msg.get('role', '')}: {msg.get('content', '')}",
-                )
-            contents = "\n".join(contents)
+            # Reject unknown types before paying for any LLM call
+            if abstract_type not in _ABSTRACT_TYPES:
+                raise ValueError("Invalid extracted_type")
+
+            contents = _join_session_content(session_content)
 
             session_summary = await self._extract_session_summary(contents)
 
             agent_key_path = None
             subtask_key_path = None
 
-            if abstract_type in ["multi_levels", "agent_levels"]:
+            # The two roadmap pipelines only depend on the summary, so run
+            # them concurrently when both are needed.
+            if abstract_type == "multi_levels":
+                agent_key_path, subtask_key_path = await asyncio.gather(
+                    self._extract_agent_roadmap(session_summary, contents),
+                    self._extract_subtask_roadmap(session_summary, contents),
+                )
+            elif abstract_type == "agent_levels":
                 agent_key_path = await self._extract_agent_roadmap(
                     session_summary,
                     contents,
                 )
-
-            if abstract_type in ["multi_levels", "subtask_levels"]:
+            elif abstract_type == "subtask_levels":
                 subtask_key_path = await self._extract_subtask_roadmap(
                     session_summary,
                     contents,
@@ -920,17 +1041,10 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
 
     async def get_summary(self, session_content):
         try:
-            contents = []
-            for msg in session_content:
-                message = msg["message"]
-                role_or_name = message.get("name", message.get("role"))
-                content = message.get("content", "")
-                contents.append(f"{role_or_name}: {content}")
-            contents = "\n".join(contents)
-            session_summary_response = await asyncio.to_thread(
-                self.llm.generate_response,
+            contents = _join_wrapped_session_content(session_content)
+            session_summary_response = await self._generate_cached_response(
                 messages=[
-                    {"role": "system", "content": SESSION_SUMMARY_PROMPT},
+                    _SESSION_SUMMARY_SYSTEM_MESSAGE,
                     {
                         "role": "user",
                         "content": (
@@ -939,44 +1053,18 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
                         ),
                     },
                 ],
-                response_format={
-                    "type": (
-                        "json_object"
-                        if "qwen-max" not in self.config.llm.config["model"]
-                        else "text"
-                    ),
-                },
+                response_format=self._json_response_format,
             )
 
-            try:
-                session_summary = json.loads(
-                    remove_code_blocks(session_summary_response),
-                )
-            except Exception as exc:
-                try:
-                    session_summary = extract_json_from_text(
-                        session_summary_response,
-                    )
-                    if not isinstance(session_summary, dict):
-                        logger.error(
-                            f"Error in extracting session summary: {exc}",
-                        )
-                        session_summary = {
-                            "task": "Unknown Task Type",
-                            "problem_category": "Unknown Task Type",
-                        }
-                except Exception as exc_inner:
-                    logger.error(
-                        f"Error in extracting session summary: {exc_inner}",
-                    )
-                    session_summary = {
-                        "task": "Unknown Task Type",
-                        "problem_category": "Unknown Task Type",
-                    }
-            return session_summary
+            return self._parse_json_with_fallback(
+                session_summary_response,
+                dict(SESSION_SUMMARY_FALLBACK),
+                "extracting session summary",
+                required_keys=tuple(SESSION_SUMMARY_FALLBACK),
+            )
 
         except Exception as exc:
-            logger.error(f"Error in get_summary: {exc}")
+            logger.error("Error in get_summary: %s", exc)
             raise
 
     async def extract_like_unlike_message(
@@ -986,37 +1074,26 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         message_type=None,
     ):
         try:
-            if message_type == "like":
-                prompt = EXTRACT_LIKE_MESSAGE.format(
-                    task_description=task_summary.get(
-                        "task",
-                        "No task description provided",
-                    ),
-                    liked_message=message,
-                    task_classification=task_summary.get(
-                        "problem_category",
-                        "Unknown",
-                    ),
+            if message_type not in _FEEDBACK_PROMPTS:
+                raise ValueError(
+                    "Invalid message_type: must be 'like' or 'dislike'.",
                 )
-            elif message_type == "dislike":
-                prompt = EXTRACT_UNLIKE_MESSAGE.format(
-                    task_description=task_summary.get(
+            template, message_field = _FEEDBACK_PROMPTS[message_type]
+            prompt = template.format_map(
+                {
+                    "task_description": task_summary.get(
                         "task",
                         "No task description provided",
                     ),
-                    unliked_message=message,
-                    task_classification=task_summary.get(
+                    message_field: message,
+                    "task_classification": task_summary.get(
                         "problem_category",
                         "Unknown",
                     ),
-                )
-            else:
-                raise ValueError(
-                    "Invalid message_type: must be 'like' or 'dislike'.",
-                )
+                },
+            )
 
-            response = await asyncio.to_thread(
-                self.llm.generate_response,
+            response = await self._generate_response(
                 messages=[{"role": "user", "content": prompt}],
             )
             return [
@@ -1027,122 +1104,57 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
             ]
 
         except Exception as exc:
-            logger.error(f"Error in extract_like_unlike_message: {exc}")
+            logger.error("Error in extract_like_unlike_message: %s", exc)
             raise
 
     async def extract_user_edit_intent(self, user_edit, edit_type):
         try:
             edit_preference = None
             if edit_type == "EDIT_ROADMAP":
-                prompt = "The content of `diff_map` is as follows:\n{diff_map}"
-                user_prompt = prompt.strip().format(
-                    diff_map=json.dumps(
-                        user_edit,
-                        indent=2,
-                        ensure_ascii=False,
-                    ),
+                user_prompt = _EDIT_ROADMAP_USER_PROMPT.format(
+                    diff_map=_dumps_for_prompt(user_edit),
                 )
-                edit_intent_response = await asyncio.to_thread(
-                    self.llm.generate_response,
+                edit_intent_response = await self._generate_response(
                     messages=[
-                        {"role": "system", "content": EXTRACT_EDIT_PREFERENCE},
+                        _EDIT_PREFERENCE_SYSTEM_MESSAGE,
                         {"role": "user", "content": user_prompt},
                     ],
-                    response_format={
-                        "type": (
-                            "json_object"
-                            if "qwen-max"
-                            not in self.config.llm.config["model"]
-                            else "text"
-                        ),
-                    },
+                    response_format=self._json_response_format,
                 )
 
-                try:
-                    edit_preference = json.loads(
-                        remove_code_blocks(edit_intent_response),
-                    )
-                except Exception as exc:
-                    try:
-                        edit_preference = extract_json_from_text(
-                            edit_intent_response,
-                        )
-                        if (
-                            not isinstance(edit_preference, dict)
-                            or "analysis_result" not in edit_preference
-                        ):
-                            logger.error(
-                                f"Error in extracting edit preference: {exc}",
-                            )
-                            edit_preference = {"analysis_result": []}
-                    except Exception as exc_inner:
-                        logger.error(
-                            f"Error in extracting edit preference: "
-                            f"{exc_inner}",
-                        )
-                        edit_preference = {"analysis_result": []}
+                edit_preference = self._parse_json_with_fallback(
+                    edit_intent_response,
+                    {"analysis_result": []},
+                    "extracting edit preference",
+                    required_keys=("analysis_result",),
+                )
 
             elif edit_type == "EDIT_FILE":
-                prompt = (
-                    "The output of a `git diff` command is as follows:\n"
-                    "{diff_output}"
-                )
-                user_prompt = prompt.strip().format(
-                    diff_output=json.dumps(
+                user_prompt = _EDIT_FILE_USER_PROMPT.format(
+                    diff_output=_dumps_for_prompt(
                         user_edit["operation_data"],
-                        indent=2,
-                        ensure_ascii=False,
                     ),
                 )
-                edit_intent_response = await asyncio.to_thread(
-                    self.llm.generate_response,
+                edit_intent_response = await self._generate_response(
                     messages=[
-                        {
-                            "role": "system",
-                            "content": EXTRACT_EDIT_FILE_PREFERENCE,
-                        },
+                        _EDIT_FILE_PREFERENCE_SYSTEM_MESSAGE,
                         {"role": "user", "content": user_prompt},
                     ],
-                    response_format={
-                        "type": (
-                            "json_object"
-                            if "qwen-max"
-                            not in self.config.llm.config["model"]
-                            else "text"
-                        ),
-                    },
+                    response_format=self._json_response_format,
+                )
+
+                edit_preference = self._parse_json_with_fallback(
+                    edit_intent_response,
+                    {"analysis_result": []},
+                    "extracting edit file preference",
+                    required_keys=("analysis_result",),
                 )
 
-                try:
-                    edit_preference = json.loads(
-                        remove_code_blocks(edit_intent_response),
-                    )
-                except Exception as exc:
-                    try:
-                        edit_preference = extract_json_from_text(
-                            edit_intent_response,
-                        )
-                        if (
-                            not isinstance(edit_preference, dict)
-                            or "analysis_result" not in edit_preference
-                        ):
-                            logger.error(
-                                f"Error in extracting edit file preference: "
-                                f"{exc}",
-                            )
-                            edit_preference = {"analysis_result": []}
-                    except Exception as exc_inner:
-                        logger.error(
-                            f"Error in extracting edit file preference: "
-                            f"{exc_inner}",
-                        )
-                        edit_preference = {"analysis_result": []}
-
-            logger.info(f"Extracted edit preference: {edit_preference}")
+            logger.info("Extracted edit preference: %s", edit_preference)
             return edit_preference
 
         except Exception as exc:
-            logger.error(f"Error in extract_user_edit_intent: {exc}")
+            logger.error("Error in extract_user_edit_intent: %s", exc)
             raise
 
     async def _extract_chat_preference(
@@ -1178,52 +1190,20 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
             "preference."
         )
 
-        preference_response = await asyncio.to_thread(
-            self.llm.generate_response,
+        preference_response = await self._generate_cached_response(
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
-            response_format={
-                "type": (
-                    "json_object"
-                    if "qwen-max" not in self.config.llm.config["model"]
-                    else "text"
-                ),
-            },
+            response_format=self._json_response_format,
         )
 
-        try:
-            preference_message = json.loads(
-                remove_code_blocks(preference_response),
-            )
-        except Exception as exc:
-            try:
-                preference_message = extract_json_from_text(
-                    preference_response,
-                )
-                if not isinstance(preference_message, dict) or (
-                    "type" not in preference_message
-                    and "user_preference" not in preference_message
-                ):
-                    logger.error(
-                        f"Error in extracting chat intent preference: {exc}",
-                    )
-                    preference_message = {
-                        "type": "irrelevant",
-                        "user_preference": "null",
-                    }
-            except Exception as exc_inner:
-                logger.error(
-                    f"Error in extracting chat intent preference: "
-                    f"{exc_inner}",
-                )
-                preference_message = {
-                    "type": "irrelevant",
-                    "user_preference": "null",
-                }
-
-        return preference_message
+        return self._parse_json_with_fallback(
+            preference_response,
+            {"type": "irrelevant", "user_preference": "null"},
+            "extracting chat intent preference",
+            required_keys=("type", "user_preference"),
+        )
 
     async def extract_chat_intent(
         self,
@@ -1232,14 +1212,9 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
         chat_message,
     ):
         try:
-            prompt_map = {
-                "START_CHAT": EXTRACT_START_CHAT_PREFERENCE,
-                "BREAK_CHAT": EXTRACT_BREAK_CHAT_PREFERENCE,
-                "FOLLOWUP_CHAT": EXTRACT_FOLLOWUP_CHAT_PREFERENCE,
-            }
-
-            if chat_type not in prompt_map:
-                logger.warning(f"Unknown chat_type: {chat_type}")
+            system_prompt = _CHAT_PROMPT_MAP.get(chat_type)
+            if system_prompt is None:
+                logger.warning("Unknown chat_type: %s", chat_type)
                 return {
                     "type": "irrelevant",
                     "user_preference": "null",
@@ -1249,11 +1224,11 @@ class AsyncVectorCandidateMemory(BaseAsyncVectorMemory):
                 chat_type,
                 chat_message,
                 session_content,
-                prompt_map[chat_type],
+                system_prompt,
             )
 
             return preference_message
 
         except Exception as exc:
-            logger.error(f"Error in extract_StartChat_message: {exc}")
+            logger.error("Error in extract_StartChat_message: %s", exc)
             raise
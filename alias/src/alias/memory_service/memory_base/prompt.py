@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import json
+
 SESSION_SUMMARY_PROMPT = """
 You are a task analysis expert. Please analyze the following session
 content and extract:
@@ -9,20 +11,27 @@ Please provide a concise summary focusing on the essence of the task
 and problem classification.
 """
 
-SESSION_SUMMARY_USER_PROMPT = """
+# Session summary returned when nothing useful can be extracted. The
+# prompt example below is rendered from it, so it is always valid JSON.
+SESSION_SUMMARY_FALLBACK = {
+    "task": "Unknown Task Type",
+    "problem_category": "Unknown Task Type",
+}
+
+SESSION_SUMMARY_USER_PROMPT = (
+    """
 You must return your response in the following JSON structure only:
-{{
+{
     "task" : "<What is the specific task>",
     "problem_category" : "<What general problem category does this belong to>"
-}}
+}
 Do not return anything except the JSON format.
 If no useful information is extracted from the session content, return
-an empty JSON object:
-{{
-    "task" : "Unknown Task Type",
-    "problem_category" : "Unknown Task Type",
-}}
+the following JSON object:
 """
+    + json.dumps(SESSION_SUMMARY_FALLBACK, indent=4)
+    + "\n"
+)
 
 AGENT_ROADMAP_PROMPT = """
 You are a task-solving process analyst. Your goal is to extract a
@@ -100,26 +109,8 @@ Important: Only return the JSON object with no additional text,
 explanations, or formatting.
 """
 
-AGENT_KEY_WORKFLOW_PROMPT = """
-Please analyze the given agent roadmap and summarize common high-level
-workflows. For each workflow, provide:
-1. A **task description**: Generalize the task (e.g., use
-   "{tourist-attractions}" instead of "West Lake and Lingyin Temple",
-   or "{product-name}" instead of "Air purifier").
-2. Several **workflow trajectories**. Each trajectory should include:
-    - **[reason]**: A description of the environment or context
-      (generalized), and the reasoning or decision behind the action.
-    - **[action]**: The specific action taken by the agent in that
-      context.
-
-Each workflow should represent a commonly reused sub-routine or sequence
-of tasks from the agent roadmap. Do **NOT** generate similar or
-overlapping workflows.
-- Each workflow must contain at least two steps.
-- Represent non-fixed elements with descriptive **variable names** (e.g.,
-  "{user-info}", "{task-name}").
-- If applicable, track **decision points** that led to branching actions.
-
+# Output format shared by the agent/subtask key workflow prompts
+_KEY_WORKFLOWS_OUTPUT_FORMAT = """
 Output the result in the following JSON format:
 {
     "workflows": [
@@ -142,9 +133,34 @@ If no workflows are identified, return an empty JSON object:
 {
     "workflows": []
 }
-Important: Only return the JSON object with no additional text,
+"""
+
+AGENT_KEY_WORKFLOW_PROMPT = (
+    """
+Please analyze the given agent roadmap and summarize common high-level
+workflows. For each workflow, provide:
+1. A **task description**: Generalize the task (e.g., use
+   "{tourist-attractions}" instead of "West Lake and Lingyin Temple",
+   or "{product-name}" instead of "Air purifier").
+2. Several **workflow trajectories**. Each trajectory should include:
+    - **[reason]**: A description of the environment or context
+      (generalized), and the reasoning or decision behind the action.
+    - **[action]**: The specific action taken by the agent in that
+      context.
+
+Each workflow should represent a commonly reused sub-routine or sequence
+of tasks from the agent roadmap. Do **NOT** generate similar or
+overlapping workflows.
+- Each workflow must contain at least two steps.
+- Represent non-fixed elements with descriptive **variable names** (e.g.,
+  "{user-info}", "{task-name}").
+- If applicable, track **decision points** that led to branching actions.
+"""
+    + _KEY_WORKFLOWS_OUTPUT_FORMAT
+    + """Important: Only return the JSON object with no additional text,
 explanations, or formatting.
 """
+)
 
 SUBTASK_ROADMAP_PROMPT = """
 You are a task-solving process analyst. Your goal is to extract a
@@ -201,7 +217,8 @@ Special Instructions:
   formatting
 """
 
-SUBTASK_KEY_WORKFLOW_PROMPT = """
+SUBTASK_KEY_WORKFLOW_PROMPT = (
+    """
 Please analyze the given task-solving roadmap and summarize common
 high-level workflows. For each workflow, provide:
 - A task description: A generalized task description that abstracts the
@@ -233,33 +250,13 @@ For a "booking a flight" task, the workflow could include:
   - Action: "Search available flights based on the selected dates."
   - Reason: "User selects a flight based on price and duration."
   - Action: "Confirm flight selection and proceed with payment."
-
-Output the result in the following JSON format:
-{
-    "workflows": [
-        {
-            "task_description": "string",
-            "trajectories": [
-                {
-                    "reason": "string",
-                    "action": "string"
-                },
-                ...
-            ]
-        },
-        ...
-    ]
-}
-
-If no workflows are identified, return an empty JSON object:
-```json
-{
-    "workflows": []
-}
-
+"""
+    + _KEY_WORKFLOWS_OUTPUT_FORMAT
+    + """
 Important: Only return the JSON object with no additional text,
 explanations, or formatting.
 """
+)
 
 MERGE_WORKFLOW_PROMPT = """
 You are given two lists of workflows, each in the following format:
@@ -423,7 +420,31 @@ Important:
   task-solving process.
 """
 
-EXTRACT_EDIT_PREFERENCE = """
+# Output format shared by the roadmap/file edit preference prompts
+_EDIT_PREFERENCE_OUTPUT_FORMAT = """
+```json
+{
+  "analysis_result": [
+  {
+    "type": "explicit" or "implicit",
+    "user_preference": "I prefer/apparently want/value ..."
+  },
+  ...
+  ]
+}
+
+If no preferences are identified, return an empty json array as follows:
+```json
+{
+  "analysis_result": []
+}
+
+Use general language: you may abstract away low-level field names into
+generalized terms (e.g., convert "allow_ssl": false into "I prefer to
+disable SSL for better compatibility")."""
+
+EXTRACT_EDIT_PREFERENCE = (
+    """
 You are an intelligent analysis agent. You are given a pair of
 dictionaries named `diff_map`, structured as follows:
 {
@@ -468,33 +489,17 @@ Finally, group and combine preferences by type:
 - If there are multiple implicit preferences, combine and summarize them
   into **one** sentence in **first-person perspective**.
 
-Return the output in this exact format (as a JSON array):
-```json
-{
-  "analysis_result": [
-  {
-    "type": "explicit" or "implicit",
-    "user_preference": "I prefer/apparently want/value ..."
-  },
-  ...
-  ]
-}
-
-If no preferences are identified, return an empty json array as follows:
-```json
-{
-  "analysis_result": []
-}
-
-Use general language: you may abstract away low-level field names into
-generalized terms (e.g., convert "allow_ssl": false into "I prefer to
-disable SSL for better compatibility").
+Return the output in this exact format (as a JSON array):"""
+    + _EDIT_PREFERENCE_OUTPUT_FORMAT
+    + """
 NOTE: Only return the JSON object with no additional text, explanations,
 or formatting.
 
 """
+)
 
-EXTRACT_EDIT_FILE_PREFERENCE = """
+EXTRACT_EDIT_FILE_PREFERENCE = (
+    """
 You are a user behavior analysis agent. You are given the output of a
 `git diff` command, which shows how a user has modified a text-based file
 (e.g., configuration files, structured markdown, JSON, YAML, or
@@ -541,32 +546,46 @@ Follow these reasoning steps carefully:
 
 ---
 Return your output as a JSON format. Each element should follow this structure:
+"""
+    + _EDIT_PREFERENCE_OUTPUT_FORMAT
+    + """
+NOTE: Only output the valid JSON array. Do not include any commentary
+or extra text.
+"""
+)
 
+# Output format and constraints shared by the start/break chat preference
+# prompts
+_CHAT_PREFERENCE_OUTPUT_FORMAT = """
+---
+
+Return your output in the following exact JSON format:
 ```json
 {
-  "analysis_result": [
-  {
-    "type": "explicit" or "implicit",
-    "user_preference": "I prefer/apparently want/value ..."
-  },
-  ...
-  ]
+  "type": "explicit" | "implicit" | "irrelevant",
+  "user_preference": "..."  // Use "null" if type is "irrelevant"
 }
-
-If no preferences are identified, return an empty json array as follows:
+If no actionable preference is identified, your response should be:
 ```json
 {
-  "analysis_result": []
+  "type": "irrelevant",
+  "user_preference": "null"
 }
-
-Use general language: you may abstract away low-level field names into
-generalized terms (e.g., convert "allow_ssl": false into "I prefer to
-disable SSL for better compatibility").
-NOTE: Only output the valid JSON array. Do not include any commentary
-or extra text.
+Important constraints:
+   -You must output only one preference (at most).
+   -If multiple interpretations exist, choose the dominant and most
+    justified one.
+   -If no meaningful preference is found, set type to "irrelevant" and
+    user_preference to "null".
+   -Use first-person voice for all non-null preferences.
+   -Use generalized language to avoid low-level field names (e.g.,
+    "allow_ssl": false → "I prefer to disable SSL for compatibility").
+   -Do not include any additional text, explanations, or comments
+    outside the JSON object.
 """
 
-EXTRACT_START_CHAT_PREFERENCE = """
+EXTRACT_START_CHAT_PREFERENCE = (
+    """
 You are an intelligent analysis agent.
 
 You are given:
@@ -609,35 +628,12 @@ Follow these reasoning steps:
 
 ---
 
-Use both `start_message` and `chat_session` to inform your judgment.
----
+Use both `start_message` and `chat_session` to inform your judgment."""
+    + _CHAT_PREFERENCE_OUTPUT_FORMAT
+)
 
-Return your output in the following exact JSON format:
-```json
-{
-  "type": "explicit" | "implicit" | "irrelevant",
-  "user_preference": "..."  // Use "null" if type is "irrelevant"
-}
-If no actionable preference is identified, your response should be:
-```json
-{
-  "type": "irrelevant",
-  "user_preference": "null"
-}
-Important constraints:
-   -You must output only one preference (at most).
-   -If multiple interpretations exist, choose the dominant and most
-    justified one.
-   -If no meaningful preference is found, set type to "irrelevant" and
-    user_preference to "null".
-   -Use first-person voice for all non-null preferences.
-   -Use generalized language to avoid low-level field names (e.g.,
-    "allow_ssl": false → "I prefer to disable SSL for compatibility").
-   -Do not include any additional text, explanations, or comments
-    outside the JSON object.
-"""
-
-EXTRACT_BREAK_CHAT_PREFERENCE = """
+EXTRACT_BREAK_CHAT_PREFERENCE = (
+    """
 You are an intelligent analysis agent.
 
 You are given the following:
@@ -678,33 +674,9 @@ Please follow these reasoning steps:
    - "I apparently care about…"
 ---
 
-Use both `break_message` and `chat_session` to inform your judgment.
----
-
-Return your output in the following exact JSON format:
-```json
-{
-  "type": "explicit" | "implicit" | "irrelevant",
-  "user_preference": "..."  // Use "null" if type is "irrelevant"
-}
-If no actionable preference is identified, your response should be:
-```json
-{
-  "type": "irrelevant",
-  "user_preference": "null"
-}
-Important constraints:
-   -You must output only one preference (at most).
-   -If multiple interpretations exist, choose the dominant and most
-    justified one.
-   -If no meaningful preference is found, set type to "irrelevant" and
-    user_preference to "null".
-   -Use first-person voice for all non-null preferences.
-   -Use generalized language to avoid low-level field names (e.g.,
-    "allow_ssl": false → "I prefer to disable SSL for compatibility").
-   -Do not include any additional text, explanations, or comments
-    outside the JSON object.
-"""
+Use both `break_message` and `chat_session` to inform your judgment."""
+    + _CHAT_PREFERENCE_OUTPUT_FORMAT
+)
 
 EXTRACT_FOLLOWUP_CHAT_PREFERENCE = """
 You are an intelligent analysis agent.
@@ -914,3 +886,24 @@ Output: ["The user traveled to Japan with their family last year"]
 
 Ok! Let's get started!
 """
+
+# Every prompt is resent with each LLM request, so growing one past this
+# many characters (roughly 1K tokens) should be a deliberate decision.
+_PROMPT_CHAR_BUDGET = 4096
+
+
+def _check_prompt_budgets() -> None:
+    """Fail at import when a prompt outgrows `_PROMPT_CHAR_BUDGET`."""
+    for name, value in list(globals().items()):
+        if (
+            name.isupper()
+            and isinstance(value, str)
+            and len(value) > _PROMPT_CHAR_BUDGET
+        ):
+            raise ValueError(
+                f"{name} is {len(value)} characters long, over the "
+                f"{_PROMPT_CHAR_BUDGET} character prompt budget",
+            )
+
+
+_check_prompt_budgets()
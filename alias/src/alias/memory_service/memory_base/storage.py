@@ -188,6 +188,46 @@ class SQLiteManager:
                 logger.error(f"Failed to add history record: {e}")
                 raise
 
+    def add_history_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert several history records in a single transaction.
+
+        Each row takes the same fields as :meth:`add_history`.
+        """
+        if not rows:
+            return
+        with self._lock:
+            try:
+                self.connection.execute("BEGIN")
+                self.connection.executemany(
+                    """
+                    INSERT INTO history (
+                        id, memory_id, old_memory, new_memory, event,
+                        created_at, updated_at, is_deleted, actor_id, role
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [
+                        (
+                            str(uuid.uuid4()),
+                            row["memory_id"],
+                            row.get("old_memory"),
+                            row.get("new_memory"),
+                            row["event"],
+                            row.get("created_at"),
+                            row.get("updated_at"),
+                            row.get("is_deleted", 0),
+                            row.get("actor_id"),
+                            row.get("role"),
+                        )
+                        for row in rows
+                    ],
+                )
+                self.connection.execute("COMMIT")
+            except Exception as e:
+                self.connection.execute("ROLLBACK")
+                logger.error(f"Failed to add history records: {e}")
+                raise
+
     def get_history(self, memory_id: str) -> List[Dict[str, Any]]:
         with self._lock:
             cur = self.connection.execute(
@@ -3,9 +3,15 @@ from __future__ import annotations
 
 import os
 from enum import Enum
-from typing import Any, List, Optional, Union
+from typing import Any, List, Literal, Optional, Union, get_args
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    field_validator,
+    model_validator,
+)
 
 
 # =============================================================================
@@ -43,6 +49,30 @@ class ActionType(str, Enum):
     TASK_STOP = "TASK_STOP"
 
 
+# Plain-string counterpart of `ActionType` used for request fields, which
+# pydantic validates as a literal membership test instead of an enum lookup
+ActionTypeValue = Literal[
+    "LIKE",
+    "DISLIKE",
+    "CANCEL_LIKE",
+    "CANCEL_DISLIKE",
+    "COLLECT_TOOL",
+    "UNCOLLECT_TOOL",
+    "COLLECT_SESSION",
+    "UNCOLLECT_SESSION",
+    "START_CHAT",
+    "FOLLOWUP_CHAT",
+    "BREAK_CHAT",
+    "EDIT_ROADMAP",
+    "EDIT_FILE",
+    "EXECUTE_SHELL_COMMAND",
+    "BROWSER_OPERATION",
+    "TASK_STOP",
+]
+if set(get_args(ActionTypeValue)) != {member.value for member in ActionType}:
+    raise ValueError("ActionTypeValue is out of sync with ActionType")
+
+
 class FeedbackType(str, Enum):
     """Feedback types for user feedback actions"""
 
@@ -62,27 +92,33 @@ class ChatType(str, Enum):
 # =============================================================================
 
 
-class ChangeRecord(BaseModel):
+class _RecordModel(BaseModel):
+    """Base class for the immutable action payload records"""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class ChangeRecord(_RecordModel):
     """Data structure for change actions (feedback, collection, etc.)"""
 
     previous: Optional[Any] = None
     current: Optional[Any] = None
 
 
-class QueryRecord(BaseModel):
+class QueryRecord(_RecordModel):
     """Data structure for chat actions"""
 
     query: Optional[str] = None
 
 
-class OperationRecord(BaseModel):
+class OperationRecord(_RecordModel):
     """Data structure for operation actions"""
 
     operation_type: str
     operation_data: Optional[dict] = None
 
 
-class Roadmap(BaseModel):
+class Roadmap(_RecordModel):
     """Data structure for roadmap editing"""
 
     content: Optional[str] = None
@@ -120,9 +156,11 @@ class BaseUserProfilingResponseWithId(BaseUserProfilingResponse):
 class UserProfilingServiceSettings(BaseModel):
     """Settings for user profiling service"""
 
-    base_url: str = os.getenv(
-        "USER_PROFILING_BASE_URL",
-        "http://localhost:8000",
+    base_url: str = Field(
+        default_factory=lambda: os.getenv(
+            "USER_PROFILING_BASE_URL",
+            "http://localhost:8000",
+        ),
     )
     # model_config = SettingsConfigDict(env_file=".env")
     timeout: int = 20  # seconds
@@ -276,7 +314,7 @@ class UserProfilingRecordActionRequest(BaseUserProfilingRequest):
     """Request for recording user actions"""
 
     session_id: str = Field(description="Session ID")
-    action_type: Optional[ActionType] = Field(
+    action_type: Optional[ActionTypeValue] = Field(
         default=None,
         description="Action type",
     )
@@ -307,12 +345,21 @@ class UserProfilingRecordActionRequest(BaseUserProfilingRequest):
         ),
     )
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    @field_validator("action_type", mode="before")
+    @classmethod
+    def _action_type_to_value(cls, value: Any) -> Any:
+        # The factory methods below pass `ActionType` members
+        if isinstance(value, ActionType):
+            return value.value
+        return value
+
+    @model_validator(mode="after")
+    def _check_action(self) -> UserProfilingRecordActionRequest:
         # Handle legacy format: if action_type is not provided but action is,
         # we'll let the server handle the conversion
         if self.action_type is None and self.action is None:
             raise ValueError("Either action_type or action must be provided")
+        return self
 
     @classmethod
     def create_feedback_action(
@@ -1,19 +1,54 @@
 # -*- coding: utf-8 -*-
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+
+# Name of the logger shared by every memory service module. Handlers are
+# attached here rather than on the root logger so that logs emitted by
+# unrelated libraries do not go through the rotating file handler.
+LOGGER_NAME = "alias.memory_service"
+
+# The real handler is owned by a background listener thread, so logging
+# calls made on the event loop only enqueue the record and never block on
+# disk writes or log rotation.
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_listener = None
+
+
+def _file_logging_enabled() -> bool:
+    return os.environ.get("LOGGING_ENABLE_FILE", "1").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
 
 
 def setup_logging():
     # Create logger
-    logger = logging.getLogger()
-    if logger.hasHandlers():
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.handlers:
         return logger  # Return the existing logger if it already has handlers
 
     logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    # Define log format, including filename and line number
+    formatter = logging.Formatter(
+        "(%(filename)s:%(lineno)d)-%(asctime)s - %(name)s - %(levelname)s - "
+        "%(message)s ",
+    )
+
+    if not _file_logging_enabled():
+        # Fall back to stderr so that records are not silently dropped
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+        return logger
 
     # Get the directory path of the current file
-    print(os.environ.get("LOGGING_DIR"))
     logging_dir = os.environ.get(
         "LOGGING_DIR",
         os.path.dirname(os.path.abspath(__file__)),
@@ -22,7 +57,6 @@ def setup_logging():
     # Use descriptive log filename without timestamp
     log_filename = "memory_service.log"
     log_filepath = os.path.join(logging_dir, log_filename)
-    # print(f"Logging to file: {log_filepath}")
 
     # Create rotating file handler with size-based rotation
     # maxBytes: 50MB per file, backupCount: keep 5 backup files
@@ -34,22 +68,20 @@ def setup_logging():
     )
     file_handler.setLevel(logging.INFO)
 
-    # Create console handler to output logs to console
-    # console_handler = logging.StreamHandler(sys.stdout)
-    # console_handler.setLevel(logging.INFO)
-
-    # Define log format, including filename and line number
-    formatter = logging.Formatter(
-        "(%(filename)s:%(lineno)d)-%(asctime)s - %(name)s - %(levelname)s - "
-        "%(message)s ",
-    )
-
     # Set format
     file_handler.setFormatter(formatter)
-    # console_handler.setFormatter(formatter)
+
+    # Hand records to the file handler from a background thread
+    global _log_listener
+    _log_listener = QueueListener(
+        _log_queue,
+        file_handler,
+        respect_handler_level=True,
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 
     # Add handler to logger
-    logger.addHandler(file_handler)
-    # logger.addHandler(console_handler)
+    logger.addHandler(QueueHandler(_log_queue))
 
     return logger
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import json
 import re
 import uuid
@@ -333,66 +333,93 @@ def format_session_content(
     return formatted_messages
 
 
-def _extract_bracket_content(
-    text: str,
-    start_pos: int,
-    open_char: str,
-    close_char: str,
-) -> Optional[Tuple[int, int]]:
+_CLOSING_BRACKETS = {"}": "{", "]": "["}
+
+
+def _merge_pending(
+    first: List[List[int]],
+    second: List[List[int]],
+) -> List[List[int]]:
     """
-    Extract content between matching brackets/braces from a given position.
-    Returns (start, end) indices if a valid match is found, None otherwise.
+    Merge two lists of pending opener buckets, aligned by how many closers
+    each opener still needs (the last bucket needs one).
     """
-    if text[start_pos] != open_char:
-        return None
-
-    count = 1
-    start = start_pos
-    pos = start_pos + 1
-    in_string = False
-    escape_next = False
-
-    while pos < len(text) and count > 0:
-        char = text[pos]
-        if escape_next:
-            escape_next = False
-        elif char == "\\" and in_string:
-            escape_next = True
-        elif char == '"' and not escape_next:
-            in_string = not in_string
-        elif not in_string:
-            if char == open_char:
-                count += 1
-            elif char == close_char:
-                count -= 1
-        pos += 1
-
-    if count == 0:
-        return (start, pos)
-    return None
+    if len(first) < len(second):
+        first, second = second, first
+    offset = len(first) - len(second)
+    for index, bucket in enumerate(second, offset):
+        if len(first[index]) < len(bucket):
+            first[index], bucket = bucket, first[index]
+        first[index].extend(bucket)
+    return first
+
+
+def _find_bracket_ends(text: str) -> Dict[int, int]:
+    """
+    Map the position of every "{" and "[" to the end of its balanced span.
+
+    Each opener is matched as if the text were scanned from it alone:
+    only its own bracket type is counted, and string state starts out
+    closed at the opener. All such scans are either outside a string or
+    in the same inside-string state, so two sets of pending openers are
+    enough, and a stray quote only hides brackets from the openers that
+    saw it. Openers that never close are left out.
+    """
+    ends: Dict[int, int] = {}
+    # Pending openers per type of the scans outside/inside a string. The
+    # last bucket holds the openers the next closer completes.
+    outside: Dict[str, List[List[int]]] = {"{": [], "[": []}
+    inside: Dict[str, List[List[int]]] = {"{": [], "[": []}
+    # Whether the scans inside a string just read a backslash
+    escaped = False
+
+    for pos, char in enumerate(text):
+        if char == '"':
+            if escaped:
+                # An escaped quote keeps the inside scans in the string,
+                # and the outside ones enter it too
+                for open_char, pending in outside.items():
+                    inside[open_char] = _merge_pending(
+                        inside[open_char],
+                        pending,
+                    )
+                outside = {"{": [], "[": []}
+                escaped = False
+            else:
+                outside, inside = inside, outside
+        elif char == "\\":
+            escaped = not escaped
+        else:
+            escaped = False
+            if char == "{" or char == "[":
+                outside[char].append([pos])
+            elif char in _CLOSING_BRACKETS:
+                pending = outside[_CLOSING_BRACKETS[char]]
+                if pending:
+                    for start in pending.pop():
+                        ends[start] = pos + 1
+    return ends
+
+
+def _iter_json_candidates(text: str) -> Iterator[str]:
+    """
+    Yield potential JSON candidates (objects and arrays) from text.
+
+    Candidates are the balanced spans that start left-most and do not
+    overlap, the same as rescanning the text from every opener, but all
+    openers are matched in one pass by `_find_bracket_ends`.
+    """
+    ends = _find_bracket_ends(text)
+    pos = 0
+    for start in sorted(ends):
+        if start >= pos:
+            pos = ends[start]
+            yield text[start:pos]
 
 
 def _extract_json_candidates(text: str) -> List[str]:
     """Extract potential JSON candidates (objects and arrays) from text."""
-    candidates = []
-    i = 0
-    while i < len(text):
-        # Try to extract object
-        result = _extract_bracket_content(text, i, "{", "}")
-        if result:
-            start, end = result
-            candidates.append(text[start:end])
-            i = end
-        else:
-            # Try to extract array
-            result = _extract_bracket_content(text, i, "[", "]")
-            if result:
-                start, end = result
-                candidates.append(text[start:end])
-                i = end
-            else:
-                i += 1
-    return candidates
+    return list(_iter_json_candidates(text))
 
 
 def _clean_json_string(json_str: str) -> str:
@@ -467,12 +494,13 @@ def extract_json_from_text(
     Returns:
         Dict/List/None: JSON object(s) found in the text.
     """
-    json_candidates = _extract_json_candidates(text)
     valid_jsons: List[Dict[str, Any]] = []
-    for candidate in json_candidates:
+    for candidate in _iter_json_candidates(text):
         parsed = _try_parse_json(candidate)
         if parsed is not None and isinstance(parsed, dict):
+            if not return_all:
+                return parsed
             valid_jsons.append(parsed)
     if return_all:
         return valid_jsons
-    return valid_jsons[0] if valid_jsons else None
+    return None
@@ -287,11 +287,7 @@ async def record_action(
 
         async def background_record_action():
             try:
-                action_value = (
-                    request.action_type.value
-                    if request.action_type
-                    else request.action
-                )
+                action_value = request.action_type or request.action
                 message_id = request.message_id or request.action_message_id
                 logger.info(
                     f"Starting background_record_action for submit_id: "
@@ -5,10 +5,10 @@ import uuid
 from copy import deepcopy
 from typing import Any, Callable, Coroutine, Dict, Literal, Optional
 
-import pytz
 from mem0.configs.base import MemoryConfig
 
 from .basememory import BaseMemory
+from .memory_base.base_vec_memory import _PACIFIC_TZ
 from .memory_base.candidate_pool import AsyncVectorCandidateMemory
 from .memory_base.userinfo_pool import AsyncVectorUserInfoMemory
 from .memory_base.userprofiling_pool import AsyncVectorUserProfilingMemory
@@ -114,7 +114,11 @@ class AsyncUserProfilingMemory(
                         k: v
                         for k, v in best_candidate["metadata"].items()
                         if k
-                        not in ["last_access_time", "visited_count", "score"]
+                        not in [
+                            "last_access_time",
+                            "visited_count",
+                            "score",
+                        ]
                     },
                 )
                 user_profiling_add_result = (
@@ -219,7 +223,8 @@ class AsyncUserProfilingMemory(
         Returns:
             The result of adding messages to the candidate pool.
         """
-        now = datetime.datetime.now(pytz.timezone("US/Pacific")).isoformat()
+        now_dt = datetime.datetime.now(_PACIFIC_TZ)
+        now = now_dt.isoformat()
         metadata = deepcopy(metadata) if metadata else {}
         if "session_id" not in metadata:
             metadata["session_id"] = session_id if session_id else ""
@@ -237,8 +242,9 @@ class AsyncUserProfilingMemory(
         metadata.update(
             {
                 "last_access_time": now,
+                "last_access_ts": now_dt.timestamp(),
                 "visited_count": 1,
-                # "score": await self.candidate_pool.compute_score(
+                # "score": self.candidate_pool.compute_score(
                 #     1, now, now_ts
                 # )
             },
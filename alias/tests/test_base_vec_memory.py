@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Test the async vector memory base class
+"""
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from alias.memory_service.memory_base import base_vec_memory
+from alias.memory_service.memory_base.base_vec_memory import (
+    BaseAsyncVectorMemory,
+)
+
+
+class _FakeEmbedder:
+    def embed(self, text, _memory_action):
+        return [float(len(text))]
+
+
+class _FakeVectorStore:
+    """Returns one hit per query; earlier queries answer more slowly."""
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    def search(self, query, vectors, limit, filters):
+        time.sleep(self.delays[query])
+        return [
+            SimpleNamespace(
+                id=f"id-{query}",
+                payload={"data": f"memory for {query}", **filters},
+                score=vectors[0],
+            ),
+        ]
+
+
+class _FakeLLM:
+    """Counts calls and answers each one with a new response."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def generate_response(self, messages, **_kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"{messages[-1]['content']} #{self.calls}"
+
+
+def _make_memory(monkeypatch, vector_store=None, llm=None):
+    monkeypatch.setattr(
+        base_vec_memory,
+        "capture_event",
+        lambda *args, **kwargs: None,
+    )
+    memory = BaseAsyncVectorMemory.__new__(BaseAsyncVectorMemory)
+    memory.enable_graph = False
+    memory.api_version = "v1.1"
+    memory.embedding_model = _FakeEmbedder()
+    memory.vector_store = vector_store
+    memory.llm = llm
+    memory.llm_concurrency = 4
+    memory._llm_semaphores = weakref.WeakKeyDictionary()
+    memory._embedding_cache = OrderedDict()
+    memory._pending_embeddings = {}
+    memory._llm_response_cache = OrderedDict()
+    memory._pending_llm_responses = {}
+    return memory
+
+
+def test_batch_search_keeps_query_order(monkeypatch):
+    """Test that batch_search returns one result per query, in order"""
+    queries = ["first", "second query", "third"]
+    vector_store = _FakeVectorStore(
+        {"first": 0.2, "second query": 0.1, "third": 0.0},
+    )
+    memory = _make_memory(monkeypatch, vector_store=vector_store)
+
+    results = asyncio.run(memory.batch_search(queries, user_id="u1"))
+
+    assert [result["results"][0]["id"] for result in results] == [
+        "id-first",
+        "id-second query",
+        "id-third",
+    ]
+    assert [result["results"][0]["score"] for result in results] == [
+        5.0,
+        12.0,
+        5.0,
+    ]
+    assert all(result["results"][0]["user_id"] == "u1" for result in results)
+
+
+def test_batch_search_empty_queries(monkeypatch):
+    """Test that batch_search with no queries does not search"""
+    memory = _make_memory(monkeypatch)
+
+    assert not asyncio.run(memory.batch_search([], user_id="u1"))
+
+
+def _ask(memory, content):
+    return memory._generate_cached_response(
+        messages=[{"role": "user", "content": content}],
+    )
+
+
+def test_cached_response_hit_within_ttl(monkeypatch):
+    """Test that a repeated request within the TTL is served from cache"""
+    llm = _FakeLLM()
+    memory = _make_memory(monkeypatch, llm=llm)
+
+    async def run():
+        return await _ask(memory, "a"), await _ask(memory, "a")
+
+    assert asyncio.run(run()) == ("a #1", "a #1")
+    assert llm.calls == 1
+
+
+def test_cached_response_expires(monkeypatch):
+    """Test that an expired entry triggers a new LLM call"""
+    llm = _FakeLLM()
+    memory = _make_memory(monkeypatch, llm=llm)
+
+    async def run():
+        first = await _ask(memory, "a")
+        for key, (_expiry, response) in list(
+            memory._llm_response_cache.items(),
+        ):
+            memory._llm_response_cache[key] = (0.0, response)
+        return first, await _ask(memory, "a")
+
+    assert asyncio.run(run()) == ("a #1", "a #2")
+    assert llm.calls == 2
+
+
+def test_cached_response_disabled_with_zero_ttl(monkeypatch):
+    """Test that a TTL of 0 bypasses the cache"""
+    monkeypatch.setattr(base_vec_memory, "_LLM_RESPONSE_CACHE_TTL", 0.0)
+    llm = _FakeLLM()
+    memory = _make_memory(monkeypatch, llm=llm)
+
+    async def run():
+        return await _ask(memory, "a"), await _ask(memory, "a")
+
+    assert asyncio.run(run()) == ("a #1", "a #2")
+    assert not memory._llm_response_cache
+
+
+def test_cached_response_coalesces_concurrent_misses(monkeypatch):
+    """Test that concurrent identical misses share one LLM call"""
+    llm = _FakeLLM(delay=0.1)
+    memory = _make_memory(monkeypatch, llm=llm)
+
+    async def run():
+        return await asyncio.gather(_ask(memory, "a"), _ask(memory, "a"))
+
+    assert asyncio.run(run()) == ["a #1", "a #1"]
+    assert llm.calls == 1
+    assert not memory._pending_llm_responses
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Test candidate pool scoring
+"""
+from datetime import datetime, timedelta
+
+from alias.memory_service.memory_base.base_vec_memory import (
+    _PACIFIC_TZ,
+    _build_memory_item,
+)
+from alias.memory_service.memory_base.candidate_pool import (
+    AsyncVectorCandidateMemory,
+)
+
+
+def test_compute_score_last_access_ts_matches_iso_fallback():
+    """Test that epoch timestamps and legacy ISO strings score the same"""
+    now = datetime.now(_PACIFIC_TZ)
+    last_access = now - timedelta(hours=5)
+
+    from_ts = AsyncVectorCandidateMemory.compute_score(
+        visited_count=3,
+        last_access_time=None,
+        now_ts=now.timestamp(),
+        last_access_ts=last_access.timestamp(),
+    )
+    from_iso = AsyncVectorCandidateMemory.compute_score(
+        visited_count=3,
+        last_access_time=last_access.isoformat(),
+        now_ts=now.timestamp(),
+    )
+
+    assert from_ts == from_iso
+    assert 0 < from_ts < 1
+
+
+def test_compute_score_prefers_last_access_ts():
+    """Test that last_access_ts wins over a stale last_access_time"""
+    now_ts = datetime.now(_PACIFIC_TZ).timestamp()
+
+    recent = AsyncVectorCandidateMemory.compute_score(
+        visited_count=1,
+        last_access_time="2000-01-01T00:00:00-08:00",
+        now_ts=now_ts,
+        last_access_ts=now_ts,
+    )
+    stale = AsyncVectorCandidateMemory.compute_score(
+        visited_count=1,
+        last_access_time="2000-01-01T00:00:00-08:00",
+        now_ts=now_ts,
+    )
+
+    assert recent > stale
+
+
+def test_compute_score_invalid_iso_string():
+    """Test that an unparsable last_access_time scores as never accessed"""
+    now_ts = datetime.now(_PACIFIC_TZ).timestamp()
+
+    invalid = AsyncVectorCandidateMemory.compute_score(
+        visited_count=1,
+        last_access_time="not a timestamp",
+        now_ts=now_ts,
+    )
+    epoch = AsyncVectorCandidateMemory.compute_score(
+        visited_count=1,
+        last_access_time=None,
+        now_ts=now_ts,
+        last_access_ts=0,
+    )
+
+    assert invalid == epoch
+
+
+def test_last_access_ts_is_not_returned_in_metadata():
+    """Test that the internal last_access_ts payload key is stripped"""
+    item = _build_memory_item(
+        "id-1",
+        {
+            "data": "likes tea",
+            "user_id": "u1",
+            "last_access_time": "2025-01-01T00:00:00-08:00",
+            "last_access_ts": 1735718400.0,
+        },
+        None,
+        False,
+    )
+
+    assert item["metadata"] == {
+        "last_access_time": "2025-01-01T00:00:00-08:00",
+    }
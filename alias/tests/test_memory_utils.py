@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Test JSON candidate extraction in the memory service utilities
+"""
+
+from alias.memory_service.profiling_utils.memory_utils import (
+    _extract_json_candidates,
+)
+
+
+def test_extract_json_candidates_balanced():
+    """Test that outermost balanced spans are extracted in order"""
+    text = 'prefix {"a": [1, 2]} middle [3, {"b": "}"}] suffix'
+
+    assert _extract_json_candidates(text) == [
+        '{"a": [1, 2]}',
+        '[3, {"b": "}"}]',
+    ]
+
+
+def test_extract_json_candidates_unmatched_closers():
+    """Test that closers without a matching opener are skipped"""
+    assert _extract_json_candidates('] } {"a": [1]} ]') == ['{"a": [1]}']
+    assert _extract_json_candidates('[ {"a": 1} } [2]') == [
+        '{"a": 1}',
+        "[2]",
+    ]
+
+
+def test_extract_json_candidates_many_unmatched_closers():
+    """Test that long runs of unmatched closers are handled in linear time"""
+    count = 20000
+
+    assert not _extract_json_candidates("[" * count + "}" * count)
+    assert not _extract_json_candidates("{" * count + "]" * count)
+    assert _extract_json_candidates("[{" * count + "]" * (2 * count)) == [
+        "[{" * count + "]" * count,
+    ]
+
+
+def test_extract_json_candidates_stray_quote_in_open_bracket():
+    """Test that a stray quote inside an unclosed bracket hides nothing"""
+    assert _extract_json_candidates('Size [5" screen] then {"a": 1}') == [
+        '{"a": 1}',
+    ]
+    text = 'Note (see [1" ref) {"type": "explicit", "user_preference": "x"}'
+    assert _extract_json_candidates(text) == [
+        '{"type": "explicit", "user_preference": "x"}',
+    ]
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Test the SQLite history storage
+"""
+import sqlite3
+
+import pytest
+
+from alias.memory_service.memory_base.storage import SQLiteManager
+
+
+def test_add_history_many_inserts_all_rows():
+    """Test that add_history_many inserts every row"""
+    manager = SQLiteManager(":memory:")
+    manager.add_history_many(
+        [
+            {
+                "memory_id": "m1",
+                "new_memory": "likes tea",
+                "event": "ADD",
+                "created_at": "2025-01-01T00:00:00",
+            },
+            {
+                "memory_id": "m1",
+                "old_memory": "likes tea",
+                "new_memory": "likes green tea",
+                "event": "UPDATE",
+                "created_at": "2025-01-02T00:00:00",
+            },
+            {
+                "memory_id": "m2",
+                "new_memory": "lives in Paris",
+                "event": "ADD",
+                "is_deleted": 1,
+            },
+        ],
+    )
+
+    history = manager.get_history("m1")
+    assert [row["event"] for row in history] == ["ADD", "UPDATE"]
+    assert history[1]["old_memory"] == "likes tea"
+    assert history[1]["new_memory"] == "likes green tea"
+    assert not history[0]["is_deleted"]
+    assert manager.get_history("m2")[0]["is_deleted"]
+
+
+def test_add_history_many_rolls_back_on_bad_row():
+    """Test that a failing row leaves no partial insert behind"""
+    manager = SQLiteManager(":memory:")
+
+    with pytest.raises(sqlite3.Error):
+        manager.add_history_many(
+            [
+                {"memory_id": "m1", "new_memory": "likes tea", "event": "ADD"},
+                {"memory_id": "m1", "new_memory": {"bad": 1}, "event": "ADD"},
+            ],
+        )
+
+    assert not manager.get_history("m1")
+
+    manager.add_history_many(
+        [{"memory_id": "m1", "new_memory": "likes tea", "event": "ADD"}],
+    )
+    assert len(manager.get_history("m1")) == 1
+
+
+def test_add_history_many_empty_rows():
+    """Test that add_history_many with no rows is a no-op"""
+    manager = SQLiteManager(":memory:")
+    manager.add_history_many([])
+
+    assert not manager.get_history("m1")